@@ -1,14 +1,20 @@
 """Lytiva integration with independent MQTT connection (single global MQTT handler)."""
 from __future__ import annotations
 import logging
-import json
 import asyncio
-from typing import Any, Callable, Dict, List, Optional
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Set, Tuple
 
 import paho.mqtt.client as mqtt_client
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.json import json_loads
 from homeassistant.helpers.entity_registry import async_get as async_get_entity_registry
 from homeassistant.helpers.device_registry import async_get as async_get_device_registry
 
@@ -28,345 +34,661 @@ PLATFORMS = [
     "scene"
 ]
 
+# platforms whose discovery configs are routed to registered callbacks
+DISCOVERY_PLATFORMS = (
+    "cover",
+    "climate",
+    "fan",
+    "light",
+    "switch",
+    "sensor",
+    "binary_sensor",
+    "scene",
+)
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up Lytiva integration with a single, central MQTT handler."""
-    hass.data.setdefault(DOMAIN, {})
+# platforms whose entities are indexed in entities_by_address and consume STATUS;
+# scenes and other-callback platforms never read it
+STATUS_PLATFORMS = frozenset(("cover", "climate", "fan", "light", "switch", "sensor", "binary_sensor"))
 
-    broker = entry.data.get("broker")
-    port = entry.data.get("port", 1883)
-    username = entry.data.get("username")
-    password = entry.data.get("password")
-    discovery_prefix = entry.options.get("discovery_prefix", "homeassistant") if entry.options else "homeassistant"
+# how a cached entity updater is invoked (see _schedule_entity_update)
+_UPDATER_ASYNC = "async"
+_UPDATER_SYNC = "sync"
+_UPDATER_BLOCKING = "blocking"
 
-    client_id = f"lytiva_{entry.entry_id}"
-    mqtt = mqtt_client.Client(
-        client_id=client_id,
-        callback_api_version=mqtt_client.CallbackAPIVersion.VERSION2,
-    )
+# one filter covers both NODE and GROUP status; _on_message does not care which
+STATUS_TOPIC = "LYT/+/+/E/STATUS"
 
-    if username:
-        mqtt.username_pw_set(username, password)
+# numeric address in a raw STATUS frame: quoted digits, or a bare integer followed by
+# a delimiter (so 12.5 and "12abc" do not match); see _probe_status_address
+_STATUS_ADDRESS_RE = re.compile(rb'"address"\s*:\s*(?:"(\d+)"|(0|[1-9]\d*)\s*[,}])')
 
-    # Integration shared storage
-    hass.data[DOMAIN][entry.entry_id] = {
-        "mqtt_client": mqtt,
-        "broker": broker,
-        "port": port,
-        "discovery_prefix": discovery_prefix,
-        # discovered payloads (raw discovery payloads by unique_id/address)
-        "discovered_payloads": {},  # type: Dict[str, Dict[str, Any]]
-        # entity objects created by platforms (map unique_id -> entity)
-        "entities_by_unique_id": {},  # type: Dict[str, Any]
-        # quick lookup by address (address may be int or str) -> entity
-        "entities_by_address": {},  # type: Dict[str, Any]
-        # platform registration callbacks
-        "cover_callbacks": [],  # type: List[Callable[[dict], None]]
-        "climate_callbacks": [],
-        "fan_callbacks": [],
-        "light_callbacks": [],
-        "switch_callbacks": [],
-        "sensor_callbacks": [],
-        "binary_sensor_callbacks": [],
-        "other_callbacks": [],
-        
-    }
+# the unique id spellings _normalize_unique_id reads, as they appear in raw frames
+_UNIQUE_ID_TOKENS = (b'"unique_id"', b'"uniqueId"', b'"uniqueid"')
 
-    # Helper: registration functions for platforms to register discovery callback
-    def register_cover_callback(callback: Callable[[dict], None]) -> None:
-        hass.data[DOMAIN][entry.entry_id]["cover_callbacks"].append(callback)
+# decoded STATUS payloads kept per entry, keyed by the raw frame bytes
+STATUS_DECODE_CACHE_SIZE = 8
+# malformed STATUS frames are counted and reported at most once per this many seconds
+MALFORMED_STATUS_LOG_INTERVAL = 60.0
 
-    def register_climate_callback(callback: Callable[[dict], None]) -> None:
-        hass.data[DOMAIN][entry.entry_id]["climate_callbacks"].append(callback)
+# retained discovery configs are parsed in bursts: flush after this much silence (s)
+DISCOVERY_BURST_IDLE = 0.1
+# ... or every this many frames while the burst keeps streaming
+DISCOVERY_BURST_MAX = 200
 
-    def register_fan_callback(callback: Callable[[dict], None]) -> None:
-        hass.data[DOMAIN][entry.entry_id]["fan_callbacks"].append(callback)
 
-    def register_light_callback(callback: Callable[[dict], None]) -> None:
-        hass.data[DOMAIN][entry.entry_id]["light_callbacks"].append(callback)
+def _register_callback(entry_data: dict, platform: str, callback: Callable[[dict], None]) -> None:
+    """Register a discovery callback for one platform.
 
-    def register_switch_callback(callback: Callable[[dict], None]) -> None:
-        hass.data[DOMAIN][entry.entry_id]["switch_callbacks"].append(callback)
+    Callback sets are tuples replaced on write, so dispatch iterates them
+    without taking a defensive copy per message.
+    """
+    callbacks = entry_data["platform_callbacks"]
+    callbacks[platform] = callbacks[platform] + (callback,)
 
-    def register_sensor_callback(callback: Callable[[dict], None]) -> None:
-        hass.data[DOMAIN][entry.entry_id]["sensor_callbacks"].append(callback)
 
-    def register_binary_sensor_callback(callback: Callable[[dict], None]) -> None:
-        hass.data[DOMAIN][entry.entry_id]["binary_sensor_callbacks"].append(callback)
-    
-    def register_other_callback(callback: Callable[[dict], None]) -> None:
-        hass.data[DOMAIN][entry.entry_id]["other_callbacks"].append(callback)
+def _register_other_callback(entry_data: dict, callback: Callable[[dict], None]) -> None:
+    """Register a discovery callback for platforms without their own entry."""
+    entry_data["other_callbacks"] = entry_data["other_callbacks"] + (callback,)
 
-    # expose registration helpers to hass.data for platforms to call
-    hass.data[DOMAIN][entry.entry_id]["register_cover_callback"] = register_cover_callback
-    hass.data[DOMAIN][entry.entry_id]["register_climate_callback"] = register_climate_callback
-    hass.data[DOMAIN][entry.entry_id]["register_fan_callback"] = register_fan_callback
-    hass.data[DOMAIN][entry.entry_id]["register_light_callback"] = register_light_callback
-    hass.data[DOMAIN][entry.entry_id]["register_switch_callback"] = register_switch_callback
-    hass.data[DOMAIN][entry.entry_id]["register_sensor_callback"] = register_sensor_callback
-    hass.data[DOMAIN][entry.entry_id]["register_binary_sensor_callback"] = register_binary_sensor_callback
-    hass.data[DOMAIN][entry.entry_id]["register_other_callback"] = register_other_callback
-
-    #
-    # Central STATUS handler: updates entity objects (by address or unique_id)
-    #
-    def _schedule_entity_update(entity, payload):
-        """Schedule entity._update_from_payload(payload). Works for async/sync methods."""
-        try:
-            # If entity has async _update_from_payload
-            update_coro = None
-            if hasattr(entity, "_update_from_payload"):
-                fn = getattr(entity, "_update_from_payload")
-                if asyncio.iscoroutinefunction(fn):
-                    # schedule coroutine on hass loop
-                    asyncio.run_coroutine_threadsafe(fn(payload), hass.loop)
-                    return
-                else:
-                    # sync function - schedule in executor to avoid blocking
-                    hass.async_add_executor_job(fn, payload)
-                    return
-        except Exception as e:
-            _LOGGER.exception("Error scheduling update for entity %s: %s", getattr(entity, "name", "<unknown>"), e)
 
-    async def handle_status_message(message):
-        """Coroutine handling an incoming STATUS payload (called from thread callback)."""
-        try:
-            raw = message.payload
-            if isinstance(raw, (bytes, bytearray)):
-                text = raw.decode("utf-8", errors="ignore")
+def batched_entity_adder(hass: HomeAssistant, async_add_entities) -> Callable[[Any], None]:
+    """Return an add(entity) for a platform that hands entities to HA in batches.
+
+    Discovery callbacks for a burst are queued on the loop back to back; entities
+    added while they run are collected and passed to a single async_add_entities
+    call once the loop gets past them, so registry and platform housekeeping is
+    amortized over the burst. add() must be called on the hass loop.
+    """
+    pending: list = []
+
+    def _flush() -> None:
+        batch = pending[:]
+        pending.clear()
+        async_add_entities(batch)
+
+    def add(entity) -> None:
+        if not pending:
+            hass.loop.call_soon(_flush)
+        pending.append(entity)
+
+    return add
+
+
+def shared_device_info(entry_data: dict, identifier, name, manufacturer, model, area=None) -> dict:
+    """Return the entry's device info dict for these fields, built on first use.
+
+    Entities of one physical device (e.g. the sensors of a multi-sensor) get the
+    same dict and identifiers set instead of equal copies; HA only reads it.
+    area=None leaves suggested_area out.
+    """
+    cache = entry_data["device_info_cache"]
+    key = (identifier, name, manufacturer, model, area)
+    info = cache.get(key)
+    if info is None:
+        info = {
+            "identifiers": {(DOMAIN, identifier)},
+            "name": name,
+            "manufacturer": manufacturer,
+            "model": model,
+        }
+        if area is not None:
+            info["suggested_area"] = area
+        cache[key] = info
+    return info
+
+
+def raw_in_outer_object(raw: bytes, pos: int) -> bool:
+    """True if pos in a raw JSON frame lies in the outermost object, ahead of any nested container.
+
+    Conservative: a brace or bracket inside an earlier string value also makes it
+    False, which only sends the frame to the full decode.
+    """
+    head = raw[:pos]
+    return head.count(b"{") == 1 and b"}" not in head and b"[" not in head
+
+
+def _probe_status_address(raw: bytes) -> Optional[str]:
+    """Index key of a raw STATUS frame's address, or None if the bytes are not conclusive.
+
+    Trusted only when the frame has a single "address" token and it sits in the
+    outermost object ahead of any nested container, so it is the key the decoder
+    reads. Anything else returns None and the caller falls through to the decode.
+    """
+    if raw.count(b'"address"') != 1:
+        return None
+    match = _STATUS_ADDRESS_RE.search(raw)
+    if match is None:
+        return None
+    if not raw_in_outer_object(raw, match.start()):
+        return None
+    return (match.group(1) or match.group(2)).decode()
+
+
+def _normalize_unique_id(payload: dict):
+    """Fold the legacy uniqueId/uniqueid spellings into payload["unique_id"] and return it."""
+    uid = payload.get("unique_id")
+    if uid is None:
+        uid = payload.pop("uniqueId", None) or payload.pop("uniqueid", None)
+        if uid is not None:
+            payload["unique_id"] = uid
+    return uid
+
+
+def _schedule_entity_update(entry_data: dict, hass: HomeAssistant, key: str, entity, payload: dict) -> None:
+    """Schedule entity._update_from_payload(payload). Works for async/sync methods.
+
+    The bound updater and its kind are resolved once per index key and cached in
+    entry_data["entity_updaters"]; the entry is refreshed if the key is re-bound
+    to a different entity.
+    """
+    try:
+        cached = entry_data["entity_updaters"].get(key)
+        if cached is None or cached[0] is not entity:
+            fn = getattr(entity, "_update_from_payload", None)
+            if fn is None:
+                return
+            if asyncio.iscoroutinefunction(fn):
+                kind = _UPDATER_ASYNC
+            elif getattr(fn, "_blocks", False):
+                kind = _UPDATER_BLOCKING
             else:
-                text = str(raw)
+                kind = _UPDATER_SYNC
+            cached = entry_data["entity_updaters"][key] = (entity, fn, kind)
+
+        _, fn, kind = cached
+        if kind is _UPDATER_ASYNC:
+            # already running on the hass loop
+            hass.async_create_task(fn(payload))
+        elif kind is _UPDATER_BLOCKING:
+            # updater explicitly marked as doing blocking I/O
+            hass.async_add_executor_job(fn, payload)
+        else:
+            # plain attribute work: run it right here on the loop, no thread-pool hop
+            fn(payload)
+    except Exception as e:
+        _LOGGER.exception("Error scheduling update for entity %s: %s", getattr(entity, "name", "<unknown>"), e)
+
+
+def _remove_entity_and_device(hass: HomeAssistant, entry_id: str, object_id: str):
+    """Remove an entity and its device (scheduled onto the hass loop from discovery)."""
+    entity_registry = async_get_entity_registry(hass)
+    device_registry = async_get_device_registry(hass)
+
+    if entity_registry is None:
+        _LOGGER.error("Entity registry not available")
+        return
+    if device_registry is None:
+        _LOGGER.error("Device registry not available")
+        return
+
+    # Find the entity entry by checking all entities from this integration
+    entity_entry = None
+    for entity_id, ent in list(entity_registry.entities.items()):
+        if (ent.unique_id == object_id or 
+            ent.unique_id == str(object_id) or
+            ent.unique_id.endswith(f"_{object_id}") or
+            ent.unique_id.endswith(f"_{str(object_id)}")):  
+            entity_entry = ent
+            _LOGGER.warning("Removing entity registry entry: %s", entity_id)
+            entity_registry.async_remove(entity_id)
+            break
+
+    if not entity_entry:
+        _LOGGER.error("Could not find entity with object_id %s in registry", object_id)
+        # Still try to clean up internal caches
+        data = hass.data[DOMAIN][entry_id]
+        data["entities_by_unique_id"].pop(object_id, None)
+        data["entities_by_unique_id"].pop(str(object_id), None)
+        data["entities_by_address"].pop(object_id, None)
+        data["entities_by_address"].pop(str(object_id), None)
+        data["entity_updaters"].pop(str(object_id), None)
+        data["last_status_raw"].pop(str(object_id), None)
+        data["discovered_payloads"].pop(object_id, None)
+        data["discovered_payloads"].pop(str(object_id), None)
+        return
+
+    # Remove the device if it has no other entities
+    if entity_entry and entity_entry.device_id:
+        device_id = entity_entry.device_id
+        # get all entities linked to this device
+        linked_entities = [
+            e for e in entity_registry.entities.values() if e.device_id == device_id
+        ]
+        if len(linked_entities) == 0:
+            try:
+                _LOGGER.warning("Removing device: %s", device_id)
+                device_registry.async_remove_device(device_id)
+            except Exception as e:
+                _LOGGER.error("Failed to remove device: %s", e)
+
+    # Remove from integration caches (try multiple formats)
+    data = hass.data[DOMAIN][entry_id]
+    data["entities_by_unique_id"].pop(object_id, None)
+    data["entities_by_unique_id"].pop(str(object_id), None)
+    data["entities_by_address"].pop(object_id, None)
+    data["entities_by_address"].pop(str(object_id), None)
+    data["entity_updaters"].pop(str(object_id), None)
+    data["last_status_raw"].pop(str(object_id), None)
+    data["discovered_payloads"].pop(object_id, None)
+    data["discovered_payloads"].pop(str(object_id), None)
+    _LOGGER.warning("Entity %s and its device removed fully.", object_id)
+
+
+#
+# Central STATUS handler: updates entity objects (by address or unique_id)
+#
+@callback
+def _handle_status_message(entry_data: dict, hass: HomeAssistant, message) -> None:
+    """Handle one incoming STATUS payload (runs on the hass loop)."""
+    entities_by_address = entry_data["entities_by_address"]
+    entities_by_unique_id = entry_data["entities_by_unique_id"]
+
+    # nothing registered yet -> there is nobody to route to, skip decoding entirely
+    if not entities_by_address and not entities_by_unique_id:
+        return
+
+    raw = message.payload
+    # heartbeat short-circuit: a byte-identical repeat of the last frame applied for this
+    # address needs neither a decode nor an entity update
+    last_raw = entry_data["last_status_raw"]
+    probe_key = _probe_status_address(raw)
+    if probe_key is not None:
+        if last_raw.get(probe_key) == raw:
+            return
+        ent = entities_by_address.get(probe_key)
+        if ent is None and not any(token in raw for token in _UNIQUE_ID_TOKENS):
+            # the exact top-level address is untracked and there is no unique id the
+            # decode could fall back on: not ours
+            return
+        # entities that only track one field can rule the frame out from the bytes
+        probe = getattr(ent, "_raw_status_unchanged", None)
+        if probe is not None and probe(raw):
+            return
 
-            payload = json.loads(text)
-        except json.JSONDecodeError:
-            _LOGGER.debug("Received non-JSON status payload on %s", getattr(message, "topic", "<unknown>"))
+    # identical frames (NODE + GROUP echo, retained repeats) reuse the last decodes
+    cache = entry_data["status_decode_cache"]
+    payload = cache.get(raw)
+    if payload is None:
+        try:
+            # orjson parses bytes directly, no intermediate str decode
+            payload = json_loads(raw)
+        except (ValueError, TypeError):
+            # malformed frames are routine with bad firmware: count them, log a summary
+            _note_malformed_status(entry_data, message)
             return
-        except Exception as e:
-            _LOGGER.exception("Error decoding status payload: %s", e)
+        if type(payload) is not dict:
+            _LOGGER.debug("Ignoring non-object status payload on %s", getattr(message, "topic", "<unknown>"))
+            return
+        if len(cache) >= STATUS_DECODE_CACHE_SIZE:
+            # dicts keep insertion order: drop the oldest entry (FIFO)
+            del cache[next(iter(cache))]
+        cache[raw] = payload
+
+    # address or unique id is necessary to map to entity
+    address = payload.get("address")
+
+    # Try address lookup; the index is keyed by str(address), payloads usually carry an int
+    if address is not None:
+        key = address if type(address) is str else str(address)
+        ent = entities_by_address.get(key)
+        if ent:
+            last_raw[key] = raw
+            _schedule_entity_update(entry_data, hass, key, ent, payload)
             return
 
-        # address or unique id is necessary to map to entity
-        address = payload.get("address")
-        unique = payload.get("unique_id") or payload.get("uniqueId") or payload.get("uniqueid")
+    # Try unique_id lookup (only normalized when the address did not match). The decoded
+    # payload is shared through the decode cache with later identical frames, so legacy
+    # spellings are folded into a copy instead of mutating the cached dict
+    unique = payload.get("unique_id")
+    if unique is None and ("uniqueId" in payload or "uniqueid" in payload):
+        payload = dict(payload)
+        unique = _normalize_unique_id(payload)
+    if unique:
+        key = unique if type(unique) is str else str(unique)
+        ent = entities_by_unique_id.get(key)
+        if ent:
+            _schedule_entity_update(entry_data, hass, key, ent, payload)
+            return
 
-        entities_by_address = hass.data[DOMAIN][entry.entry_id]["entities_by_address"]
-        entities_by_unique_id = hass.data[DOMAIN][entry.entry_id]["entities_by_unique_id"]
+    # no entity matched — optionally we can store this status for later
+    _LOGGER.debug("Status received but no matching entity found (address=%s unique=%s)", address, unique)
 
-        # Try address lookup (address might be int or string)
-        if address is not None:
-            # try both direct and stringified matching
-            ent = entities_by_address.get(address) or entities_by_address.get(str(address))
-            if ent:
-                _schedule_entity_update(ent, payload)
-                return
 
-        # Try unique_id lookup
-        if unique:
-            ent = entities_by_unique_id.get(str(unique))
-            if ent:
-                _schedule_entity_update(ent, payload)
-                return
+def _note_malformed_status(entry_data: dict, message) -> None:
+    """Count a non-JSON STATUS frame; warn once per MALFORMED_STATUS_LOG_INTERVAL."""
+    entry_data["malformed_status_count"] += 1
+    now = time.monotonic()
+    if now - entry_data["malformed_status_logged"] < MALFORMED_STATUS_LOG_INTERVAL:
+        return
+    _LOGGER.warning(
+        "Ignored %d malformed STATUS payload(s) since last report (last topic=%s)",
+        entry_data["malformed_status_count"], getattr(message, "topic", "<unknown>"),
+    )
+    entry_data["malformed_status_count"] = 0
+    entry_data["malformed_status_logged"] = now
 
-        # If not found, try scanning all entities (fallback)
-        for ent in list(entities_by_unique_id.values()):
-            try:
-                ent_addr = getattr(ent, "address", None)
-                ent_uid = getattr(ent, "_attr_unique_id", None) or getattr(ent, "unique_id", None)
-                if ent_addr is not None and str(ent_addr) == str(address):
-                    _schedule_entity_update(ent, payload)
-                    return
-                if ent_uid is not None and str(ent_uid) == str(unique):
-                    _schedule_entity_update(ent, payload)
-                    return
-            except Exception:
-                continue
 
-        # no entity matched — optionally we can store this status for later
-        _LOGGER.debug("Status received but no matching entity found (address=%s unique=%s)", address, unique)
+def _forget_status(entry_data: dict, address) -> None:
+    """Drop the remembered STATUS frame for address.
 
-    # Thread callback for paho -> schedule coroutine on hass loop
-    def on_status(client, userdata, message):
+    Platforms call this (as entry_data["forget_status"]) after publishing a command
+    that changes state optimistically, so the device's next report is applied even
+    if it is byte-identical to the previous one.
+    """
+    entry_data["last_status_raw"].pop(address if type(address) is str else str(address), None)
+
+
+@callback
+def _drain_status_queue(entry_data: dict, hass: HomeAssistant) -> None:
+    """Process every queued STATUS frame in one loop callback."""
+    queue = entry_data["status_queue"]
+    # clear the flag first so a frame appended mid-drain schedules a new drain
+    entry_data["drain_scheduled"] = False
+    while queue:
+        message = queue.popleft()
         try:
-            # schedule the coroutine to run safely on hass loop
-            asyncio.run_coroutine_threadsafe(handle_status_message(message), hass.loop)
+            _handle_status_message(entry_data, hass, message)
         except Exception as e:
-            _LOGGER.exception("Failed to schedule status handler: %s", e)
+            _LOGGER.exception("Error handling status message: %s", e)
 
-    #
-    # Discovery (homeassistant/+/+/config) handler: store payload and call registered callbacks
-    #
-    def on_discovery(client, userdata, message):
-        try:
-            raw = message.payload
-            if isinstance(raw, (bytes, bytearray)):
-                text = raw.decode("utf-8", errors="ignore")
-            else:
-                text = str(raw)
-            payload = json.loads(text)
-        except Exception:
-            _LOGGER.exception("Invalid discovery JSON on %s", getattr(message, "topic", "<unknown>"))
-            return
 
-        if payload == {}:
-            topic_parts = message.topic.split("/")
-            if len(topic_parts) >= 4:
-                platform = topic_parts[1]
-                object_id = topic_parts[2]
-
-                _LOGGER.warning(
-                    "Removing entity %s (platform %s) and its device immediately due to empty discovery payload.",
-                    object_id, platform
-                )
-
-                def remove_entity_and_device(hass: HomeAssistant, entry_id: str, object_id: str):
-                    """Remove an entity and its device safely from MQTT thread."""
-                    entity_registry = async_get_entity_registry(hass)
-                    device_registry = async_get_device_registry(hass)
-
-                    if entity_registry is None:
-                        _LOGGER.error("Entity registry not available")
-                        return
-                    if device_registry is None:
-                        _LOGGER.error("Device registry not available")
-                        return
-                    
-                    # Find the entity entry by checking all entities from this integration
-                    entity_entry = None
-                    for entity_id, ent in list(entity_registry.entities.items()):
-                        if (ent.unique_id == object_id or 
-                            ent.unique_id == str(object_id) or
-                            ent.unique_id.endswith(f"_{object_id}") or
-                            ent.unique_id.endswith(f"_{str(object_id)}")):  
-                            entity_entry = ent
-                            _LOGGER.warning("Removing entity registry entry: %s", entity_id)
-                            entity_registry.async_remove(entity_id)
-                            break
-                    
-                    if not entity_entry:
-                        _LOGGER.error("Could not find entity with object_id %s in registry", object_id)
-                        # Still try to clean up internal caches
-                        data = hass.data[DOMAIN][entry_id]
-                        data["entities_by_unique_id"].pop(object_id, None)
-                        data["entities_by_unique_id"].pop(str(object_id), None)
-                        data["entities_by_address"].pop(object_id, None)
-                        data["entities_by_address"].pop(str(object_id), None)
-                        data["discovered_payloads"].pop(object_id, None)
-                        data["discovered_payloads"].pop(str(object_id), None)
-                        return
-
-                    # Remove the device if it has no other entities
-                    if entity_entry and entity_entry.device_id:
-                        device_id = entity_entry.device_id
-                        # get all entities linked to this device
-                        linked_entities = [
-                            e for e in entity_registry.entities.values() if e.device_id == device_id
-                        ]
-                        if len(linked_entities) == 0:
-                            try:
-                                _LOGGER.warning("Removing device: %s", device_id)
-                                device_registry.async_remove_device(device_id)
-                            except Exception as e:
-                                _LOGGER.error("Failed to remove device: %s", e)
-
-                    # Remove from integration caches (try multiple formats)
-                    data = hass.data[DOMAIN][entry_id]
-                    data["entities_by_unique_id"].pop(object_id, None)
-                    data["entities_by_unique_id"].pop(str(object_id), None)
-                    data["entities_by_address"].pop(object_id, None)
-                    data["entities_by_address"].pop(str(object_id), None)
-                    data["discovered_payloads"].pop(object_id, None)
-                    data["discovered_payloads"].pop(str(object_id), None)
-                    _LOGGER.warning("Entity %s and its device removed fully.", object_id)
-
-                # Schedule safely from MQTT thread
-                hass.loop.call_soon_threadsafe(
-                    lambda: remove_entity_and_device(hass, entry.entry_id, object_id)
-                )
-            return
+def _on_status(entry_data: dict, hass: HomeAssistant, message) -> None:
+    """Paho thread: queue the frame, wake the hass loop once per batch."""
+    entry_data["status_queue"].append(message)
+    if entry_data["drain_scheduled"]:
+        return
+    entry_data["drain_scheduled"] = True
+    try:
+        hass.loop.call_soon_threadsafe(_drain_status_queue, entry_data, hass)
+    except Exception as e:
+        entry_data["drain_scheduled"] = False
+        _LOGGER.exception("Failed to schedule status handler: %s", e)
+
+
+#
+# Discovery (homeassistant/+/+/config) handler: store payload and call registered callbacks
+#
+def _on_discovery(entry_data: dict, hass: HomeAssistant, message) -> None:
+    """Buffer the frame; the paho thread returns to the socket straight away.
+
+    Retained configs arrive in bursts on (re)connect. The burst is handed to the
+    discovery worker once the topic has been idle for DISCOVERY_BURST_IDLE, or
+    every DISCOVERY_BURST_MAX frames while it keeps streaming.
+    """
+    burst = entry_data["discovery_burst"]
+    burst.append((message.payload, message.topic))
+    entry_data["discovery_last"] = time.monotonic()
+
+    # the worker drains the deque concurrently, so its length says nothing about
+    # what is still unsubmitted; count appends since the last submit instead
+    with entry_data["discovery_count_lock"]:
+        entry_data["discovery_unsubmitted"] += 1
+        full = entry_data["discovery_unsubmitted"] >= DISCOVERY_BURST_MAX
+    if full:
+        _submit_discovery_burst(entry_data, hass)
+
+    if entry_data["discovery_burst_scheduled"]:
+        return
+    entry_data["discovery_burst_scheduled"] = True
+    try:
+        hass.loop.call_soon_threadsafe(
+            hass.loop.call_later, DISCOVERY_BURST_IDLE, _flush_discovery_burst, entry_data, hass
+        )
+    except RuntimeError:
+        # loop closed (shutting down)
+        entry_data["discovery_burst_scheduled"] = False
+
+
+def _flush_discovery_burst(entry_data: dict, hass: HomeAssistant) -> None:
+    """Loop timer: submit the buffered burst once discovery traffic has gone quiet."""
+    idle = time.monotonic() - entry_data["discovery_last"]
+    if idle < DISCOVERY_BURST_IDLE:
+        hass.loop.call_later(DISCOVERY_BURST_IDLE - idle, _flush_discovery_burst, entry_data, hass)
+        return
+    # clear the flag before submitting so a frame arriving now arms a new timer
+    entry_data["discovery_burst_scheduled"] = False
+    _submit_discovery_burst(entry_data, hass)
+
+
+def _submit_discovery_burst(entry_data: dict, hass: HomeAssistant) -> None:
+    # every submit (size cap on the paho thread, idle timer on the loop) starts a new count
+    with entry_data["discovery_count_lock"]:
+        entry_data["discovery_unsubmitted"] = 0
+    try:
+        entry_data["discovery_executor"].submit(_process_discovery_burst, entry_data, hass)
+    except RuntimeError:
+        # executor already shut down (entry unloading)
+        pass
 
-        unique_id = payload.get("unique_id") or payload.get("uniqueId") or payload.get("uniqueid") or payload.get("address")
-        if unique_id is None:
-            _LOGGER.debug("Discovery payload without unique id: %s", payload)
-            return
 
-        # Determine platform from topic or payload
-        topic_parts = message.topic.split("/") if message.topic else []
-        platform = None
-        # typical discovery topic: homeassistant/<platform>/<node>/<object>/config
-        if len(topic_parts) >= 2:
-            platform = topic_parts[1]
+def _process_discovery_burst(entry_data: dict, hass: HomeAssistant) -> None:
+    """Drain every buffered discovery frame (runs on the single discovery worker)."""
+    burst = entry_data["discovery_burst"]
+    while burst:
+        raw, topic = burst.popleft()
+        try:
+            _process_discovery(entry_data, hass, raw, topic)
+        except Exception as e:
+            _LOGGER.exception("Error processing discovery frame on %s: %s", topic, e)
 
-        unique_id = str(unique_id)
-        # Store both payload and platform
-        hass.data[DOMAIN][entry.entry_id]["discovered_payloads"][unique_id] = {
-            "payload": payload,
-            "platform": platform
-        }
-        _LOGGER.debug("Discovery payload stored for unique_id=%s platform=%s", unique_id, platform)
 
-        # Call appropriate callbacks (safe)
+def _process_discovery(entry_data: dict, hass: HomeAssistant, raw, topic: str) -> None:
+    """Parse a discovery frame and hand it to the loop (runs on the discovery worker thread)."""
+    try:
+        payload = json_loads(raw)
+    except Exception:
+        _LOGGER.exception("Invalid discovery JSON on %s", topic)
+        return
+
+    if payload == {}:
+        topic_parts = topic.split("/")
+        if len(topic_parts) >= 4:
+            platform = topic_parts[1]
+            object_id = topic_parts[2]
+
+            _LOGGER.warning(
+                "Removing entity %s (platform %s) and its device immediately due to empty discovery payload.",
+                object_id, platform
+            )
+
+            # Schedule safely from MQTT thread
+            hass.loop.call_soon_threadsafe(_remove_entity_and_device, hass, entry_data["entry_id"], object_id)
+        return
+
+    # normalize once here so platforms only ever read payload["unique_id"]
+    unique_id = _normalize_unique_id(payload)
+    if unique_id is None:
+        unique_id = payload.get("address")
+    if unique_id is None:
+        _LOGGER.debug("Discovery payload without unique id: %s", payload)
+        return
+
+    # Determine platform from topic or payload
+    topic_parts = topic.split("/") if topic else []
+    platform = None
+    # typical discovery topic: homeassistant/<platform>/<node>/<object>/config
+    if len(topic_parts) >= 2:
+        platform = topic_parts[1]
+
+    # JSON strings already decode to str; only numeric ids (e.g. the address fallback) need coercing
+    if type(unique_id) is not str:
+        unique_id = str(unique_id)
+    try:
+        hass.loop.call_soon_threadsafe(_dispatch_discovery, entry_data, unique_id, platform, payload)
+    except RuntimeError:
+        # loop closed (shutting down)
+        pass
+
+
+@callback
+def _dispatch_discovery(entry_data: dict, unique_id: str, platform, payload: dict) -> None:
+    """Store a parsed discovery config and hand it to its platform (runs on the hass loop).
+
+    discovered_payloads and dispatched_uids are only touched on the loop, so this
+    cannot interleave with the post-setup replay in async_setup_entry.
+    """
+    # Store both payload and platform
+    entry_data["discovered_payloads"][unique_id] = {
+        "payload": payload,
+        "platform": platform
+    }
+    _LOGGER.debug("Discovery payload stored for unique_id=%s platform=%s", unique_id, platform)
+
+    callbacks = entry_data["platform_callbacks"].get(platform, entry_data["other_callbacks"])
+    if not callbacks:
+        return
+    entry_data["dispatched_uids"].add(unique_id)
+    _ensure_status_subscribed(entry_data, platform)
+    for cb in callbacks:
         try:
-            if platform == "cover":
-                for cb in list(hass.data[DOMAIN][entry.entry_id]["cover_callbacks"]):
-                    hass.loop.call_soon_threadsafe(cb, payload)
-            elif platform == "climate":
-                for cb in list(hass.data[DOMAIN][entry.entry_id]["climate_callbacks"]):
-                    hass.loop.call_soon_threadsafe(cb, payload)
-            elif platform == "fan":
-                for cb in list(hass.data[DOMAIN][entry.entry_id]["fan_callbacks"]):
-                    hass.loop.call_soon_threadsafe(cb, payload)
-            elif platform == "light":
-                for cb in list(hass.data[DOMAIN][entry.entry_id]["light_callbacks"]):
-                    hass.loop.call_soon_threadsafe(cb, payload)
-            elif platform == "switch":
-                for cb in list(hass.data[DOMAIN][entry.entry_id]["switch_callbacks"]):
-                    hass.loop.call_soon_threadsafe(cb, payload)
-            elif platform == "sensor":
-                for cb in list(hass.data[DOMAIN][entry.entry_id]["sensor_callbacks"]):
-                    hass.loop.call_soon_threadsafe(cb, payload)
-            elif platform == "binary_sensor":
-                for cb in list(hass.data[DOMAIN][entry.entry_id]["binary_sensor_callbacks"]):
-                    hass.loop.call_soon_threadsafe(cb, payload)
-            else:
-                # call any other registered callbacks
-                for cb in list(hass.data[DOMAIN][entry.entry_id]["other_callbacks"]):
-                    hass.loop.call_soon_threadsafe(cb, payload)
+            cb(payload)
         except Exception as e:
             _LOGGER.exception("Error calling discovery callbacks: %s", e)
 
-    #
-    # Paho MQTT connect/message handlers
-    #
-    def on_connect(client, userdata, flags, reason_code, *args):
-        if reason_code == 0:
-            _LOGGER.info("Connected to MQTT %s:%s", broker, port)
-            try:
-                client.publish("homeassistant/status", "online", qos=1, retain=True)
-            except Exception:
-                pass
-            # subscribe discovery + status topics via message_callback_add (single owner)
-            try:
-                client.subscribe(f"{discovery_prefix}/+/+/config")
-                client.message_callback_add(f"{discovery_prefix}/+/+/config", on_discovery)
-            except Exception as e:
-                _LOGGER.exception("Failed to subscribe discovery topic: %s", e)
 
-            try:
-                client.subscribe("LYT/+/NODE/E/STATUS")
-                client.message_callback_add("LYT/+/NODE/E/STATUS", on_status)
-                client.subscribe("LYT/+/GROUP/E/STATUS")
-                client.message_callback_add("LYT/+/GROUP/E/STATUS", on_status)
-            except Exception as e:
-                _LOGGER.exception("Failed to subscribe STATUS topics: %s", e)
-        else:
-            _LOGGER.error("MQTT connection failed: %s", reason_code)
+#
+# Paho MQTT connect/message handlers
+#
+def _ensure_status_subscribed(entry_data: dict, platform) -> None:
+    """Subscribe STATUS_TOPIC the first time a config reaches a STATUS_PLATFORMS platform.
+
+    Until then no entity can consume STATUS frames, so the broker is not asked
+    for them; scene-only installs never are. Called on the hass loop.
+    """
+    if platform not in STATUS_PLATFORMS:
+        return
+    entry_data["status_wanted"] = True
+    if entry_data["status_subscribed"]:
+        return
+    entry_data["status_subscribed"] = True
+    try:
+        result, _mid = entry_data["mqtt_client"].subscribe(STATUS_TOPIC)
+    except Exception as e:
+        result = e
+    if result != 0:
+        # not connected (yet): _on_connect subscribes once the session is up
+        entry_data["status_subscribed"] = False
+        _LOGGER.debug("Deferred STATUS subscription: %s", result)
+
+
+def _on_connect(entry_data: dict, client, userdata, flags, reason_code, *args) -> None:
+    if reason_code == 0:
+        _LOGGER.info("Connected to MQTT %s:%s", entry_data["broker"], entry_data["port"])
+        try:
+            client.publish("homeassistant/status", "online", qos=1, retain=True)
+        except Exception:
+            pass
+        # discovery (+ status, once entities exist) in one SUBSCRIBE packet;
+        # routing happens in _on_message
+        topics = [(f"{entry_data['discovery_prefix']}/+/+/config", 0)]
+        entry_data["status_subscribed"] = entry_data["status_wanted"]
+        if entry_data["status_subscribed"]:
+            topics.append((STATUS_TOPIC, 0))
+        try:
+            client.subscribe(topics)
+        except Exception as e:
+            _LOGGER.exception("Failed to subscribe discovery/STATUS topics: %s", e)
+    else:
+        _LOGGER.error("MQTT connection failed: %s", reason_code)
+
+
+def _on_message(entry_data: dict, hass: HomeAssistant, client, userdata, msg) -> None:
+    topic = msg.topic
+    handler = entry_data["routes"].get((topic.partition("/")[0], topic.rpartition("/")[2]))
+    if handler is None:
+        _LOGGER.debug("Fallback on_message for topic %s", topic)
+        return
+    handler(entry_data, hass, msg)
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up Lytiva integration with a single, central MQTT handler."""
+    hass.data.setdefault(DOMAIN, {})
+
+    broker = entry.data.get("broker")
+    port = entry.data.get("port", 1883)
+    username = entry.data.get("username")
+    password = entry.data.get("password")
+    discovery_prefix = entry.options.get("discovery_prefix", "homeassistant") if entry.options else "homeassistant"
+
+    client_id = f"lytiva_{entry.entry_id}"
+    mqtt = mqtt_client.Client(
+        client_id=client_id,
+        callback_api_version=mqtt_client.CallbackAPIVersion.VERSION2,
+    )
 
-    def on_message_fallback(client, userdata, msg):
-        # fallback - we mainly rely on message_callback_add handlers above
-        _LOGGER.debug("Fallback on_message for topic %s", msg.topic)
+    if username:
+        mqtt.username_pw_set(username, password)
 
-    mqtt.on_connect = on_connect
-    mqtt.on_message = on_message_fallback
+    # Integration shared storage
+    hass.data[DOMAIN][entry.entry_id] = {
+        "entry_id": entry.entry_id,
+        "mqtt_client": mqtt,
+        "broker": broker,
+        "port": port,
+        "discovery_prefix": discovery_prefix,
+        # discovered payloads (raw discovery payloads by unique_id/address)
+        "discovered_payloads": {},  # type: Dict[str, Dict[str, Any]]
+        # unique ids already handed to a platform callback (skipped by the post-setup replay)
+        "dispatched_uids": set(),  # type: Set[str]
+        # STATUS_TOPIC is only subscribed once a config has been handed to a STATUS platform
+        "status_subscribed": False,
+        # set once a STATUS_PLATFORMS config was dispatched; (re)connects subscribe if so
+        "status_wanted": False,
+        # entity objects created by platforms (map str(unique_id) -> entity)
+        "entities_by_unique_id": {},  # type: Dict[str, Any]
+        # quick lookup by address; platforms insert str(address) keys at registration
+        "entities_by_address": {},  # type: Dict[str, Any]
+        # index key -> (entity, bound _update_from_payload, updater kind), filled lazily
+        "entity_updaters": {},  # type: Dict[str, Tuple[Any, Callable, str]]
+        # platform discovery callbacks, keyed by the <platform> topic level
+        "platform_callbacks": {platform: () for platform in DISCOVERY_PLATFORMS},  # type: Dict[str, Tuple[Callable[[dict], None], ...]]
+        # callbacks for any platform without its own entry above
+        "other_callbacks": (),  # type: Tuple[Callable[[dict], None], ...]
+        # STATUS frames queued by the paho thread, drained in batches on the hass loop
+        "status_queue": deque(),  # type: deque
+        "drain_scheduled": False,
+        # raw STATUS bytes -> decoded payload (FIFO, STATUS_DECODE_CACHE_SIZE entries);
+        # the dicts are shared by identical frames and must be treated as read-only
+        "status_decode_cache": {},  # type: Dict[bytes, Dict[str, Any]]
+        "malformed_status_count": 0,
+        "malformed_status_logged": float("-inf"),
+        # str(address) -> raw bytes of the last STATUS frame applied to that entity
+        "last_status_raw": {},  # type: Dict[str, bytes]
+        # (identifier, name, manufacturer, model, area) -> device info shared by entities
+        "device_info_cache": {},  # type: Dict[Tuple[Any, ...], Dict[str, Any]]
+        # scene state topic -> scenes listening on it (one paho callback per topic fans out)
+        "scene_state_routes": {},  # type: Dict[str, Tuple[Any, ...]]
+        # discovery JSON is parsed off the paho network thread; a single worker keeps
+        # config/removal frames for the same object in arrival order
+        "discovery_executor": ThreadPoolExecutor(max_workers=1, thread_name_prefix="lytiva-json"),
+        # (payload, topic) frames buffered by the paho thread until the burst goes quiet
+        "discovery_burst": deque(),  # type: deque
+        "discovery_last": 0.0,
+        # frames appended since the last burst submit; written by the paho thread and
+        # the loop's idle flush, so only under discovery_count_lock
+        "discovery_unsubmitted": 0,
+        "discovery_count_lock": threading.Lock(),
+        "discovery_burst_scheduled": False,
+    }
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+
+    # expose registration helpers to hass.data for platforms to call
+    for platform in DISCOVERY_PLATFORMS:
+        entry_data[f"register_{platform}_callback"] = partial(_register_callback, entry_data, platform)
+    entry_data["register_other_callback"] = partial(_register_other_callback, entry_data)
+    entry_data["forget_status"] = partial(_forget_status, entry_data)
+
+    # (first topic level, last topic level) -> handler, built once per entry:
+    #   <discovery_prefix>/<platform>/<object_id>/config -> _on_discovery
+    #   LYT/<project>/<NODE|GROUP>/E/STATUS            -> _on_status
+    entry_data["routes"] = {
+        (discovery_prefix.split("/", 1)[0], "config"): _on_discovery,
+        ("LYT", "STATUS"): _on_status,
+    }
+
+    mqtt.on_connect = partial(_on_connect, entry_data)
+    mqtt.on_message = partial(_on_message, entry_data, hass)
     mqtt.will_set("homeassistant/status", "offline", qos=1, retain=True)
 
     # Connect (in executor) and start loop
@@ -375,6 +697,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         await hass.async_add_executor_job(mqtt.loop_start)
     except Exception as e:
         _LOGGER.error("Could not connect/start MQTT: %s", e)
+        entry_data["discovery_executor"].shutdown(wait=False)
         return False
 
     # Forward platforms (load platform modules)
@@ -384,52 +707,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         _LOGGER.exception("Error forwarding platforms: %s", e)
 
     # After platforms are loaded, force-call callbacks for any already discovered payloads
+    # (on the loop, like _dispatch_discovery, so the check-and-add below cannot race it)
     try:
-        discovered_items = hass.data[DOMAIN][entry.entry_id]["discovered_payloads"].values()
-        for item in discovered_items:
-            # Check if we have the new structure with platform
-            if isinstance(item, dict) and "platform" in item and "payload" in item:
-                payload = item["payload"]
-                platform = item["platform"]
-            else:
-                # Fallback for old structure (should not happen after restart with new code, but good for safety)
-                payload = item
-                platform = None
-            
-            # Dispatch based on platform
-            if platform:
-                callbacks = []
-                if platform == "cover":
-                    callbacks = hass.data[DOMAIN][entry.entry_id]["cover_callbacks"]
-                elif platform == "climate":
-                    callbacks = hass.data[DOMAIN][entry.entry_id]["climate_callbacks"]
-                elif platform == "fan":
-                    callbacks = hass.data[DOMAIN][entry.entry_id]["fan_callbacks"]
-                elif platform == "light":
-                    callbacks = hass.data[DOMAIN][entry.entry_id]["light_callbacks"]
-                elif platform == "switch":
-                    callbacks = hass.data[DOMAIN][entry.entry_id]["switch_callbacks"]
-                elif platform == "sensor":
-                    callbacks = hass.data[DOMAIN][entry.entry_id]["sensor_callbacks"]
-                elif platform == "binary_sensor":
-                    callbacks = hass.data[DOMAIN][entry.entry_id]["binary_sensor_callbacks"]
-                else:
-                    callbacks = hass.data[DOMAIN][entry.entry_id]["other_callbacks"]
-                
-                for cb in callbacks:
-                    hass.loop.call_soon_threadsafe(cb, payload)
-            else:
-                # Fallback heuristic (only if platform is missing)
-                called = False
-                if "device_class" in payload and "cover" in str(payload.get("device_class","")).lower():
-                    for cb in hass.data[DOMAIN][entry.entry_id]["cover_callbacks"]:
-                        hass.loop.call_soon_threadsafe(cb, payload)
-                        called = True
-                if not called and ("state_topic" in payload or "command_topic" in payload or "unique_id" in payload):
-                    # Default to light if we really don't know, but log a warning
-                    _LOGGER.warning("Discovered payload with no platform info, defaulting to light: %s", payload)
-                    for cb in hass.data[DOMAIN][entry.entry_id]["light_callbacks"]:
-                        hass.loop.call_soon_threadsafe(cb, payload)
+        dispatched = entry_data["dispatched_uids"]
+        for unique_id, item in list(entry_data["discovered_payloads"].items()):
+            # already delivered to a registered callback during normal discovery
+            if unique_id in dispatched:
+                continue
+            callbacks = entry_data["platform_callbacks"].get(item["platform"], entry_data["other_callbacks"])
+            if not callbacks:
+                continue
+            dispatched.add(unique_id)
+            _ensure_status_subscribed(entry_data, item["platform"])
+            for cb in callbacks:
+                hass.loop.call_soon_threadsafe(cb, item["payload"])
     except Exception as e:
         _LOGGER.exception("Error during initial dispatch of discovered payloads: %s", e)
 
@@ -455,6 +746,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             await hass.async_add_executor_job(mqtt.disconnect)
         except Exception:
             pass
+        hass.data[DOMAIN][entry.entry_id]["discovery_executor"].shutdown(wait=False)
 
         hass.data[DOMAIN].pop(entry.entry_id, None)
 
@@ -1,14 +1,13 @@
 """Lytiva Binary Sensors via central STATUS handler (generic, live updates)."""
 from __future__ import annotations
 import logging
-import json
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.template import Template
 
-from . import DOMAIN
+from . import DOMAIN, batched_entity_adder, shared_device_info
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,8 +24,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     store = hass.data[DOMAIN][entry.entry_id]
     by_uid = store["entities_by_unique_id"]
     by_addr = store["entities_by_address"]
+    add_entity = batched_entity_adder(hass, async_add_entities)
 
-    async def add_binary_sensor(payload: dict):
+    def add_binary_sensor(payload: dict):
         uid = str(payload.get("unique_id") or payload.get("address"))
         if uid in by_uid:
             return
@@ -35,11 +35,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
         by_uid[uid] = sensor
         by_addr[str(sensor.address)] = sensor
 
-        async_add_entities([sensor])
+        add_entity(sensor)
         _LOGGER.info("Discovered Lytiva binary sensor: %s", sensor.name)
 
     # register callback
-    store.setdefault("binary_sensor_callbacks", []).append(lambda payload: hass.async_create_task(add_binary_sensor(payload)))
+    # discovery callbacks already run on the hass loop: add directly, no task per config
+    store["register_binary_sensor_callback"](add_binary_sensor)
 
 class LytivaBinarySensor(BinarySensorEntity):
     """Generic binary sensor with live updates via central STATUS topic."""
@@ -58,27 +59,29 @@ class LytivaBinarySensor(BinarySensorEntity):
         # Address
         try:
             self.address = int(cfg.get("address") or self._attr_unique_id)
-        except Exception:
+        except (TypeError, ValueError):
             self.address = self._attr_unique_id
 
         self._device_class = cfg.get("device_class")
         self._payload_on = cfg.get("payload_on", "ON")
         self._payload_off = cfg.get("payload_off", "OFF")
+        # normalized once; every update compares against this form
+        self._payload_on_norm = str(self._payload_on).strip().lower()
         self._value_template = cfg.get("value_template")
-        self._icon = cfg.get("icon") or DEFAULT_ICONS.get(self._device_class, DEFAULT_ICONS["default"])
+        # HA Template compiles once and keeps the compiled form on the instance
+        self._compiled_template = Template(self._value_template, hass) if self._value_template else None
+        # fixed per entity: HA reads _attr_icon directly
+        self._attr_icon = cfg.get("icon") or DEFAULT_ICONS.get(self._device_class) or DEFAULT_ICONS["default"]
 
         device_info = cfg.get("device", {})
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, str(device_info.get("identifiers", [self._attr_unique_id])[0]))},
-            "name": device_info.get("name", self._attr_name),
-            "manufacturer": device_info.get("manufacturer", "Lytiva"),
-            "model": device_info.get("model", "Binary Sensor"),
-            "suggested_area": device_info.get("suggested_area", "Unknown"),
-        }
-
-    @property
-    def icon(self):
-        return self._icon
+        self._attr_device_info = shared_device_info(
+            hass.data[DOMAIN][entry_id],
+            str(device_info.get("identifiers", [self._attr_unique_id])[0]),
+            device_info.get("name", self._attr_name),
+            device_info.get("manufacturer", "Lytiva"),
+            device_info.get("model", "Binary Sensor"),
+            device_info.get("suggested_area", "Unknown"),
+        )
 
     @property
     def is_on(self):
@@ -93,7 +96,8 @@ class LytivaBinarySensor(BinarySensorEntity):
         """Return additional attributes."""
         return self._attributes
 
-    async def _update_from_payload(self, payload: dict):
+    @callback
+    def _update_from_payload(self, payload: dict):
         """Update binary sensor state from STATUS payload (generic)."""
         try:
             if str(payload.get("address")) != str(self.address):
@@ -109,9 +113,8 @@ class LytivaBinarySensor(BinarySensorEntity):
 
             # Evaluate template if provided
             value = None
-            if self._value_template:
-                template = Template(self._value_template, self.hass)
-                value = template.async_render({"value_json": payload}).strip().lower()
+            if self._compiled_template is not None:
+                value = str(self._compiled_template.async_render({"value_json": payload})).strip().lower()
             else:
                 # Fallback: check for boolean-like fields automatically
                 for v in sensor_data.values():
@@ -122,14 +125,20 @@ class LytivaBinarySensor(BinarySensorEntity):
                         value = "true" if v else "false"
                         break
 
-            if value is not None:
-                self._state = value == str(self._payload_on).lower()
-
-            for k, v in sensor_data.items():
-                if k not in ("occupancy", "motion", "parking", "state"):
-                    self._attributes[k] = v
-
-                self.async_write_ha_state()
+            new_state = self._state if value is None else value == self._payload_on_norm
+            new_attributes = {
+                k: v for k, v in sensor_data.items() if k not in ("occupancy", "motion", "parking", "state")
+            }
+            self._apply_state(new_state, new_attributes)
 
         except Exception as e:
             _LOGGER.exception("Binary sensor update failed: %s", e)
+
+    @callback
+    def _apply_state(self, new_state, new_attributes: dict):
+        """Apply a computed state and write it once (must run on the hass loop)."""
+        self._state = new_state
+        self._attributes.update(new_attributes)
+        # not added yet (batched add pending): HA writes the applied state on add
+        if self.platform is not None:
+            self.async_write_ha_state()
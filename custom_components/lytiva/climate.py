@@ -1,14 +1,16 @@
 """Lytiva IR AC Climate via MQTT - integrated with central MQTT handler (discovery + live STATUS)."""
 from __future__ import annotations
 import logging
-import json
+import re
+from functools import lru_cache
+from types import MappingProxyType
 
-from jinja2 import Template
+from jinja2 import Environment
 
 from homeassistant.components.climate import ClimateEntity, ClimateEntityFeature, HVACMode
 from homeassistant.const import UnitOfTemperature
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.restore_state import RestoreEntity
 from typing import Any, Dict
 
@@ -16,34 +18,80 @@ from . import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
-HVAC_MAP = {
+# read-only views: shared by every entity and never mutated at runtime
+HVAC_MAP = MappingProxyType({
     "cool": HVACMode.COOL,
     "heat": HVACMode.HEAT,
     "dry": HVACMode.DRY,
     "fan_only": HVACMode.FAN_ONLY,
     "auto": HVACMode.AUTO,
-}
-REVERSE_HVAC = {v: k for k, v in HVAC_MAP.items()}
+})
+REVERSE_HVAC = MappingProxyType({v: k for k, v in HVAC_MAP.items()})
+# restorable HVAC state strings
+_HVAC_VALUES = frozenset(mode.value for mode in HVACMode)
+# IR AC STATUS fan_speed 1..6 -> fan mode; 0 and unknown speeds map to the first configured mode
+_FAN_SPEED_NAMES = (None, "Vlow", "Low", "Med", "High", "Top", "Auto")
 
+# one shared environment; templates are compiled from it once, not per message/command
+_ENV = Environment(autoescape=False)
+# constant render context lives in the environment, not in every render() call;
+# per-call kwargs (e.g. the fan template's own `mapping`) still take precedence
+_ENV.globals.update(mapping=REVERSE_HVAC, hvac_map=HVAC_MAP)
 
-def _parse_template(template_str: str | None, msg_payload: Any) -> str | None:
-    """Parse Jinja2 template with payload."""
-    if not template_str:
-        return None
-    try:
-        try:
-            payload_json = json.loads(msg_payload)
-        except Exception:
-            payload_json = {}
-        t = Template(template_str)
-        result = t.render(
-            value_json=payload_json,
-            value=msg_payload.decode() if isinstance(msg_payload, (bytes, bytearray)) else msg_payload,
-        )
-        return result.strip()
-    except Exception as e:
-        _LOGGER.error("Template render error: %s | Template: %s", e, template_str)
-        return None
+# coalesce state writes that land within this window (s) into one HA update
+UPDATE_DEBOUNCE = 0.05
+
+
+# a bare "{{ value }}" (commands only ever render value=) — rendered without Jinja
+_FAST_TEMPLATE_RE = re.compile(r"^\{\{\s*value\s*\}\}$")
+_MISSING = object()
+
+
+class _FastTemplate:
+    """Render-compatible stand-in for a bare "{{ value }}" template."""
+
+    __slots__ = ()
+
+    def render(self, **context) -> str:
+        value = context.get("value", _MISSING)
+        # Jinja renders an undefined name as an empty string
+        return "" if value is _MISSING else str(value)
+
+
+class _SubstituteTemplate:
+    """Render-compatible stand-in for literal text around a single "{{ value }}"."""
+
+    __slots__ = ("_prefix", "_suffix")
+
+    def __init__(self, prefix: str, suffix: str):
+        self._prefix = prefix
+        # Jinja drops a single trailing newline from the rendered output
+        self._suffix = suffix[:-1] if suffix.endswith("\n") else suffix
+
+    def render(self, **context) -> str:
+        value = context.get("value", _MISSING)
+        return f"{self._prefix}{'' if value is _MISSING else value}{self._suffix}"
+
+
+# literal text + exactly one "{{ value }}", e.g. '{"temperature": {{ value }}}'
+_VALUE_SUBST_RE = re.compile(r"\{\{\s*value\s*\}\}")
+_JINJA_DELIMITERS = ("{{", "{%", "{#")
+
+
+@lru_cache(maxsize=256)
+def _compile(src: str):
+    """Compile a template source once process-wide (entities often share discovery templates)."""
+    if _FAST_TEMPLATE_RE.match(src):
+        return _FastTemplate()
+    parts = _VALUE_SUBST_RE.split(src)
+    if len(parts) == 2 and not any(d in part for part in parts for d in _JINJA_DELIMITERS):
+        return _SubstituteTemplate(parts[0], parts[1])
+    return _ENV.from_string(src)
+
+
+def _tenths(value) -> float:
+    """Round a STATUS temperature to 0.1; orjson floats are used as-is, not re-converted."""
+    return round(value if type(value) is float else float(value), 1)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities) -> None:
@@ -65,11 +113,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
             if uid in by_uid:
                 _LOGGER.debug("Climate already exists (uid=%s) - updating payload", uid)
                 ent = by_uid[uid]
-                try:
-                    ent.payload = payload
-                    ent._cfg = payload  # keep consistent with older code expecting _cfg
-                except Exception:
-                    pass
+                ent.payload = payload
+                ent._cfg = payload  # keep consistent with older code expecting _cfg
                 return
 
             # Create entity
@@ -103,6 +148,15 @@ class LytivaClimateEntity(ClimateEntity, RestoreEntity):
         self._name = payload.get("name", "Lytiva Climate")
         self._unique_id = str(payload.get("unique_id") or payload.get("address") or f"lytiva_climate_{id(payload)}")
         self._address = payload.get("address")
+        # STATUS addresses are normally ints: compare against those first, str() only as a fallback
+        self._address_str = str(self._address)
+        try:
+            address_int = int(self._address)
+        except (TypeError, ValueError):
+            address_int = None
+        # only an int that prints back as the same text ("05" -> 5 does not): the int
+        # fast path must accept exactly what the str(addr) compare accepts
+        self._address_int = address_int if str(address_int) == self._address_str else None
 
         # Command topics and templates (from discovery)
         self._topic_mode_cmd = payload.get("mode_command_topic")
@@ -115,6 +169,12 @@ class LytivaClimateEntity(ClimateEntity, RestoreEntity):
         self._fan_mode_command_template = payload.get("fan_mode_command_template")
         self._preset_mode_command_template = payload.get("preset_mode_command_template")
 
+        # compiled once here; the async_set_* methods only render
+        self._mode_cmd_tpl = _compile(self._mode_command_template) if self._mode_command_template else None
+        self._temp_cmd_tpl = _compile(self._temp_command_template) if self._temp_command_template else None
+        self._fan_cmd_tpl = _compile(self._fan_mode_command_template) if self._fan_mode_command_template else None
+        self._preset_cmd_tpl = _compile(self._preset_mode_command_template) if self._preset_mode_command_template else None
+
         # State templates (kept for compatibility; live updates come from STATUS)
         self._mode_state_template = payload.get("mode_state_template")
         self._target_temp_template = payload.get("target_temperature_template")
@@ -124,10 +184,13 @@ class LytivaClimateEntity(ClimateEntity, RestoreEntity):
 
         # Supported values
         modes = payload.get("modes", ["cool", "heat", "dry", "fan_only", "auto"])
-        self._hvac_modes = [HVAC_MAP.get(m) for m in modes if m in HVAC_MAP]
+        # ordered and de-duplicated in one pass; OFF is not offered (power is the On/Off preset)
+        self._hvac_modes = list(dict.fromkeys(HVAC_MAP[m] for m in modes if m in HVAC_MAP))
 
         self._fan_modes = payload.get("fan_modes", ["Vlow", "Low", "Med", "High", "Top", "Auto"])
         self._preset_modes = payload.get("preset_modes", ["On", "Off"])
+        # 1-based command index per fan mode, passed to the fan command template as `mapping`
+        self._fan_mode_index = {fm: i + 1 for i, fm in enumerate(self._fan_modes)}
 
         # Device info
         dev_meta = payload.get("device", {}) or {}
@@ -135,8 +198,31 @@ class LytivaClimateEntity(ClimateEntity, RestoreEntity):
         self._model = dev_meta.get("model", "IR AC")
         self._area = dev_meta.get("suggested_area")
 
+        # fixed after discovery: HA reads these as plain attributes instead of calling properties
+        self._attr_name = self._name
+        self._attr_unique_id = self._unique_id
+        self._attr_temperature_unit = UnitOfTemperature.CELSIUS
+        # fan modes are fixed by discovery, so the feature mask is too
+        features = ClimateEntityFeature.TARGET_TEMPERATURE | ClimateEntityFeature.PRESET_MODE
+        if self._fan_modes:
+            features |= ClimateEntityFeature.FAN_MODE
+        self._attr_supported_features = features
+        # no device in the discovery payload -> do not create a device entry
+        self._attr_device_info = None
+        if payload.get("device"):
+            self._attr_device_info = {
+                "identifiers": {(DOMAIN, self._unique_id)},
+                "name": dev_meta.get("name", self._name),
+                "manufacturer": self._manufacturer,
+                "model": self._model,
+            }
+            if self._area:
+                self._attr_device_info["suggested_area"] = self._area
+
         # State defaults
         self._available = True
+        self._pending_update_handle = None
+        self._removed = False
         self._target_temp = float(payload.get("min_temp", 24))
         self._current_temp = None
         self._fan_mode = self._fan_modes[0] if self._fan_modes else None
@@ -147,149 +233,122 @@ class LytivaClimateEntity(ClimateEntity, RestoreEntity):
         self._min_temp = payload.get("min_temp", 16)
         self._max_temp = payload.get("max_temp", 30)
         self._temp_step = payload.get("temp_step", 1)
+        # offered modes and limits never change after discovery: plain _attr_* reads for HA
+        self._attr_hvac_modes = self._hvac_modes
+        self._attr_fan_modes = self._fan_modes
+        self._attr_preset_modes = self._preset_modes
+        self._attr_min_temp = self._min_temp
+        self._attr_max_temp = self._max_temp
+        self._attr_target_temperature_step = self._temp_step
 
-        _LOGGER.info("Initialized LytivaClimateEntity: %s (uid=%s address=%s)", self._name, self._unique_id, self._address)
+        _LOGGER.debug("Initialized LytivaClimateEntity: %s (uid=%s address=%s)", self._name, self._unique_id, self._address)
 
     # -----------------------------
     # Central STATUS update
     # -----------------------------
-    async def _update_from_payload(self, payload: dict):
+    @callback
+    def _update_from_payload(self, payload: dict):
         """Update climate state from central STATUS payload with unit handling."""
         try:
             # verify address matches
             if self._address is not None:
-                if str(payload.get("address")) != str(self._address):
+                addr = payload.get("address")
+                if not (type(addr) is int and addr == self._address_int) and str(addr) != self._address_str:
                     return
 
             ir_ac = payload.get("ir_ac") or payload.get("ir") or {}
             updated = False
 
-            # hvac mode
-            mode = ir_ac.get("mode")
-            if mode:
-                if mode == "fan":
-                    mode = "fan_only"
-                if mode in HVAC_MAP:
-                    new_mode = HVAC_MAP[mode]
-                    if new_mode != self._hvac_mode:
-                        self._hvac_mode = new_mode
-                        updated = True
-
-            # target temperature
-            if "temperature" in ir_ac:
-                try:
-                    t = float(ir_ac.get("temperature"))
-                    t = round(t, 1)  # no conversion, assume Celsius
-                    if t != self._target_temp:
-                        self._target_temp = t
-                        updated = True
-                except Exception:
-                    pass
-
-            # current temperature
-            if "current_temperature" in ir_ac:
-                try:
-                    ct = float(ir_ac.get("current_temperature"))
-                    ct = round(ct, 1)  # no conversion, assume Celsius
-                    if ct != self._current_temp:
-                        self._current_temp = ct
-                        updated = True
-                except Exception:
-                    pass
-
-            # fan speed mapping
-            if "fan_speed" in ir_ac:
-                try:
-                    fan_speed = int(ir_ac.get("fan_speed", 0))
-                    mapping = {0: self._fan_modes[0] if self._fan_modes else None,
-                            1: "Vlow", 2: "Low", 3: "Med", 4: "High", 5: "Top", 6: "Auto"}
-                    new_fan_mode = mapping.get(fan_speed, self._fan_modes[0] if self._fan_modes else None)
-                    if new_fan_mode != self._fan_mode:
-                        self._fan_mode = new_fan_mode
-                        updated = True
-                except Exception:
-                    pass
-
-            # preset/power
-            if "power" in ir_ac:
-                p = bool(ir_ac.get("power"))
-                new_preset = "On" if p else "Off"
-                if new_preset != self._preset:
-                    self._preset = new_preset
+            # one table lookup per field present instead of probing every known key
+            handlers = self._IR_AC_HANDLERS
+            for key, value in ir_ac.items():
+                handler = handlers.get(key)
+                if handler is not None and handler(self, value):
                     updated = True
 
             if updated:
                 self._available = True
-                try:
-                    self.async_write_ha_state()
-                except Exception:
-                    self.schedule_update_ha_state()
+                self._queue_update()
 
         except Exception as e:
             _LOGGER.exception("Climate update error for %s: %s", self._name, e)
 
+    # ir_ac field handlers: each applies one value and returns True if state changed
+    def _apply_mode(self, mode) -> bool:
+        if not mode:
+            return False
+        if mode == "fan":
+            mode = "fan_only"
+        new_mode = HVAC_MAP.get(mode)
+        if new_mode is None or new_mode == self._hvac_mode:
+            return False
+        self._hvac_mode = new_mode
+        return True
+
+    def _apply_target_temp(self, value) -> bool:
+        try:
+            t = _tenths(value)  # no conversion, assume Celsius
+        except (TypeError, ValueError):
+            return False
+        if t == self._target_temp:
+            return False
+        self._target_temp = t
+        return True
+
+    def _apply_current_temp(self, value) -> bool:
+        try:
+            ct = _tenths(value)  # no conversion, assume Celsius
+        except (TypeError, ValueError):
+            return False
+        if ct == self._current_temp:
+            return False
+        self._current_temp = ct
+        return True
+
+    def _apply_fan_speed(self, value) -> bool:
+        try:
+            fan_speed = int(value)
+        except (TypeError, ValueError):
+            return False
+        if 0 < fan_speed < len(_FAN_SPEED_NAMES):
+            new_fan_mode = _FAN_SPEED_NAMES[fan_speed]
+        else:
+            new_fan_mode = self._fan_modes[0] if self._fan_modes else None
+        if new_fan_mode == self._fan_mode:
+            return False
+        self._fan_mode = new_fan_mode
+        return True
+
+    def _apply_power(self, value) -> bool:
+        new_preset = "On" if bool(value) else "Off"
+        if new_preset == self._preset:
+            return False
+        self._preset = new_preset
+        return True
+
+    _IR_AC_HANDLERS = {
+        "mode": _apply_mode,
+        "temperature": _apply_target_temp,
+        "current_temperature": _apply_current_temp,
+        "fan_speed": _apply_fan_speed,
+        "power": _apply_power,
+    }
+
     # -----------------------------
     # properties
     # -----------------------------
-    @property
-    def name(self):
-        return self._name
-
-    @property
-    def unique_id(self):
-        return self._unique_id
-
-    @property
-    def device_info(self):
-        dev = self._cfg.get("device")
-        # If no device provided → DO NOT create a device entry
-        if not dev:
-            return None
-
-        identifiers = dev.get("identifiers")
-        if isinstance(identifiers, (list, tuple)) and identifiers:
-            identifiers = {(DOMAIN, identifiers[0])}
-        else:
-            identifiers = {(DOMAIN, self._attr_unique_id)}
-
-        info = {
-            "identifiers": {(DOMAIN, self._unique_id)},
-            "name": self.payload.get("device", {}).get("name", self._name),
-            "manufacturer": self._manufacturer,
-            "model": self._model,
-        }
-        if self._area:
-            info["suggested_area"] = self._area
-        return info
-
     @property
     def available(self):
         return self._available
 
-    @property
-    def temperature_unit(self):
-        return UnitOfTemperature.CELSIUS
-
-    @property
-    def hvac_modes(self):
-        return self._hvac_modes
-
     @property
     def hvac_mode(self):
         return self._hvac_mode
 
-    @property
-    def fan_modes(self):
-        return self._fan_modes
-
     @property
     def fan_mode(self):
         return self._fan_mode
 
-    @property
-    def preset_modes(self):
-        return self._preset_modes
-
     @property
     def preset_mode(self):
         return self._preset
@@ -302,25 +361,6 @@ class LytivaClimateEntity(ClimateEntity, RestoreEntity):
     def target_temperature(self):
         return self._target_temp
 
-    @property
-    def min_temp(self):
-        return self._min_temp
-
-    @property
-    def max_temp(self):
-        return self._max_temp
-
-    @property
-    def target_temperature_step(self):
-        return self._temp_step
-
-    @property
-    def supported_features(self):
-        features = ClimateEntityFeature.TARGET_TEMPERATURE | ClimateEntityFeature.PRESET_MODE
-        if self._fan_modes:
-            features |= ClimateEntityFeature.FAN_MODE
-        return features
-
     @property
     def extra_state_attributes(self):
         return {
@@ -342,10 +382,11 @@ class LytivaClimateEntity(ClimateEntity, RestoreEntity):
             _LOGGER.error("Unknown HVAC mode requested: %s", hvac_mode)
             return
         try:
-            payload = Template(self._mode_command_template).render(value=mode_str, mapping=REVERSE_HVAC)
+            payload = self._mode_cmd_tpl.render(value=mode_str)
             self._integration["mqtt_client"].publish(self._topic_mode_cmd, payload)
+            self._integration["forget_status"](self._address)
             self._hvac_mode = hvac_mode
-            self.schedule_update_ha_state()
+            self._queue_update()
         except Exception as e:
             _LOGGER.error("Failed to publish HVAC mode command: %s", e, exc_info=True)
 
@@ -356,10 +397,11 @@ class LytivaClimateEntity(ClimateEntity, RestoreEntity):
             return
         try:
             temp = max(self._min_temp, min(self._max_temp, float(temp)))
-            payload = Template(self._temp_command_template).render(value=int(temp))
+            payload = self._temp_cmd_tpl.render(value=int(temp))
             self._integration["mqtt_client"].publish(self._topic_temp_cmd, payload)
+            self._integration["forget_status"](self._address)
             self._target_temp = temp
-            self.schedule_update_ha_state()
+            self._queue_update()
         except Exception as e:
             _LOGGER.error("Failed to publish temperature command: %s", e, exc_info=True)
 
@@ -371,13 +413,14 @@ class LytivaClimateEntity(ClimateEntity, RestoreEntity):
             _LOGGER.error("Invalid fan mode: %s for %s", fan_mode, self._name)
             return
         try:
-            payload = Template(self._fan_mode_command_template).render(
+            payload = self._fan_cmd_tpl.render(
                 value=fan_mode,
-                mapping={fm: i + 1 for i, fm in enumerate(self._fan_modes)}
+                mapping=self._fan_mode_index
             )
             self._integration["mqtt_client"].publish(self._topic_fan_mode_cmd, payload)
+            self._integration["forget_status"](self._address)
             self._fan_mode = fan_mode
-            self.schedule_update_ha_state()
+            self._queue_update()
         except Exception as e:
             _LOGGER.error("Failed to publish fan mode command: %s", e, exc_info=True)
 
@@ -389,31 +432,58 @@ class LytivaClimateEntity(ClimateEntity, RestoreEntity):
             _LOGGER.error("Invalid preset requested: %s", preset_mode)
             return
         try:
-            payload = Template(self._preset_mode_command_template).render(value=preset_mode)
+            payload = self._preset_cmd_tpl.render(value=preset_mode)
             self._integration["mqtt_client"].publish(self._topic_preset_cmd, payload)
+            self._integration["forget_status"](self._address)
             self._preset = preset_mode
-            self.schedule_update_ha_state()
+            self._queue_update()
         except Exception as e:
             _LOGGER.error("Failed to publish preset command: %s", e, exc_info=True)
 
+    @callback
+    def _queue_update(self):
+        """Schedule one debounced state write; further changes inside the window ride along."""
+        # not added yet (add pending): HA writes the applied state on add
+        if self._pending_update_handle is None and not self._removed and self.platform is not None:
+            self._pending_update_handle = self.hass.loop.call_later(UPDATE_DEBOUNCE, self._flush_update)
+
+    @callback
+    def _flush_update(self):
+        self._pending_update_handle = None
+        # a timer can outlive the entity; never write state for a removed climate
+        if self._removed:
+            return
+        try:
+            self.async_write_ha_state()
+        except Exception as e:
+            _LOGGER.error("Climate state write error: %s", e, exc_info=True)
+
+    async def async_will_remove_from_hass(self):
+        """Drop a pending debounced write for an entity that is going away."""
+        self._removed = True
+        if self._pending_update_handle is not None:
+            self._pending_update_handle.cancel()
+            self._pending_update_handle = None
+        await super().async_will_remove_from_hass()
+
     async def async_added_to_hass(self):
         """Restore previous state when added to hass."""
         await super().async_added_to_hass()
         old_state = await self.async_get_last_state()
         if old_state is not None:
-            _LOGGER.info("Restoring previous state for %s", self._name)
+            _LOGGER.debug("Restoring previous state for %s", self._name)
             try:
-                if old_state.state in [mode.value for mode in HVACMode]:
+                if old_state.state in _HVAC_VALUES:
                     self._hvac_mode = HVACMode(old_state.state)
-            except Exception:
+            except ValueError:
                 pass
             if old_state.attributes.get("temperature"):
                 try:
                     self._target_temp = float(old_state.attributes["temperature"])
-                except Exception:
+                except (TypeError, ValueError):
                     pass
             if old_state.attributes.get("fan_mode"):
                 self._fan_mode = old_state.attributes.get("fan_mode")
             if old_state.attributes.get("preset_mode"):
                 self._preset = old_state.attributes.get("preset_mode")
-            _LOGGER.info("Previous state restored for %s", self._name)
+            _LOGGER.debug("Previous state restored for %s", self._name)
@@ -3,17 +3,28 @@ device_info with suggested_area, duplicate protection, centralized MQTT publish
 """
 from __future__ import annotations
 import logging
-import json
+import re
 from typing import Any, Dict, Optional
 
 from homeassistant.components.cover import CoverEntity, CoverEntityFeature
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import async_get as async_get_device_registry
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.json import json_loads
 
-from . import DOMAIN
+from . import DOMAIN, batched_entity_adder, raw_in_outer_object
 
 _LOGGER = logging.getLogger(__name__)
 
+# shared stand-in for discovery payloads without a "device" block (read-only)
+_NO_DEVICE: dict = {}
+
+# curtain.curtain_level in a raw STATUS frame: a bare integer field of the "curtain"
+# object itself, ahead of anything nested in it (see _raw_status_unchanged)
+_CURTAIN_KEY_RE = re.compile(rb'"curtain"\s*:')
+_LEVEL_RE = re.compile(rb'"curtain"\s*:\s*\{[^{}\[\]]*?"curtain_level"\s*:\s*(0|[1-9]\d*)\s*[,}]')
+
 
 # -----------------------------
 #  PLATFORM SETUP (Discovery)
@@ -23,7 +34,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     register_cb = data.get("register_cover_callback")
 
     if register_cb:
-        register_cb(lambda payload: _handle_discovery(hass, entry, payload, async_add_entities))
+        add_entity = batched_entity_adder(hass, async_add_entities)
+        register_cb(lambda payload: _handle_discovery(hass, entry, payload, add_entity))
         _LOGGER.debug("Lytiva Cover: discovery callback registered.")
     else:
         _LOGGER.warning("Lytiva Cover: register_cover_callback NOT found.")
@@ -32,14 +44,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
 # -----------------------------
 #  DISCOVERY HANDLER
 # -----------------------------
-def _handle_discovery(hass: HomeAssistant, entry: ConfigEntry, payload: Dict[str, Any], async_add_entities):
+def _handle_discovery(hass: HomeAssistant, entry: ConfigEntry, payload: Dict[str, Any], add_entity):
     try:
         uid = payload.get("unique_id") or payload.get("address")
         if uid is None:
             _LOGGER.debug("Lytiva Cover discovery payload missing unique id/address: %s", payload)
             return
 
-        uid = str(uid)
+        # JSON ids are usually str already; only numeric ones (address fallback) need coercing
+        if type(uid) is not str:
+            uid = str(uid)
 
         # If discovery payload didn't include address, use unique_id as address (fallback)
         if "address" not in payload or payload.get("address") in (None, ""):
@@ -53,9 +67,9 @@ def _handle_discovery(hass: HomeAssistant, entry: ConfigEntry, payload: Dict[str
         if uid in by_uid:
             ent = by_uid[uid]
             try:
-                ent._cfg = payload
+                ent.update_config(payload)
             except Exception:
-                pass
+                _LOGGER.exception("Lytiva Cover config update failed for uid=%s", uid)
             _LOGGER.debug("Lytiva Cover discovery: existing entity updated uid=%s", uid)
             return
 
@@ -66,18 +80,18 @@ def _handle_discovery(hass: HomeAssistant, entry: ConfigEntry, payload: Dict[str
             try:
                 # Map the uid -> existing entity so future lookups by unique_id work
                 by_uid[uid] = ent
-                ent._cfg = payload
+                ent.update_config(payload)
             except Exception:
-                pass
+                _LOGGER.exception("Lytiva Cover config update failed for address=%s", addr_str)
             _LOGGER.debug("Lytiva Cover discovery: existing entity found by address=%s", addr_str)
             return
 
         # create new entity
         ent = LytivaCurtain(hass, entry, payload)
         by_uid[uid] = ent
-        by_addr[str(ent.address)] = ent
+        by_addr[ent._address_str] = ent
 
-        hass.add_job(async_add_entities, [ent])
+        add_entity(ent)
         _LOGGER.info("Lytiva Cover added: %s (uid=%s address=%s)", ent.name, uid, ent.address)
 
     except Exception as e:
@@ -111,8 +125,10 @@ class LytivaCurtain(CoverEntity):
         try:
             # some discovery send numeric addresses; enforce int when possible
             self.address = int(addr)
-        except Exception:
+        except (TypeError, ValueError):
             self.address = str(addr)
+        # canonical index key (entities_by_address is keyed by str(address))
+        self._address_str = str(self.address)
 
         # topics / payloads from discovery
         self._command_topic: Optional[str] = self._cfg.get("command_topic")
@@ -122,31 +138,54 @@ class LytivaCurtain(CoverEntity):
         self._payload_open: Optional[Any] = self._cfg.get("payload_open")
         self._payload_close: Optional[Any] = self._cfg.get("payload_close")
         self._payload_stop: Optional[Any] = self._cfg.get("payload_stop")
+        # set_position_template pre-split around "{{ position }}": a command is one str.join
+        self._set_position_parts: Optional[list] = _split_position_template(self._set_position_template)
 
         # runtime state
-        self._position: Optional[int] = None
+        self._attr_current_cover_position: Optional[int] = None
+        self._attr_is_closed: Optional[bool] = None
         self._attr_available = True
 
-        # device metadata
-        dev_meta = self._cfg.get("device", {}) or {}
-        self._manufacturer = dev_meta.get("manufacturer", "Lytiva")
-        self._model = dev_meta.get("model", "Curtain")
-        self._area = dev_meta.get("suggested_area")
-        self._sw_version = dev_meta.get("sw_version")
-        self._hw_version = dev_meta.get("hw_version")
+        self._attr_device_info = self._load_device_meta()
 
-        _LOGGER.debug(
-            "Initialized LytivaCurtain name=%s uid=%s address=%s state_topic=%s set_position_template=%s",
-            self._attr_name, self._attr_unique_id, self.address, self._state_topic, bool(self._set_position_template),
-        )
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Initialized LytivaCurtain name=%s uid=%s address=%s state_topic=%s set_position_template=%s",
+                self._attr_name, self._attr_unique_id, self.address, self._state_topic, bool(self._set_position_template),
+            )
+
+    def update_config(self, cfg: Dict[str, Any]) -> None:
+        """Adopt a re-discovered config, re-deriving what __init__ built from it."""
+        self._cfg = cfg or {}
+        self._set_position_template = self._cfg.get("set_position_template")
+        self._set_position_parts = _split_position_template(self._set_position_template)
+
+        info = self._load_device_meta()
+        if info == self._attr_device_info:
+            return
+        self._attr_device_info = info
+        # HA only reads device info when the entity is added: push changes for a live one
+        if info and self.platform is not None:
+            async_get_device_registry(self.hass).async_get_or_create(
+                config_entry_id=self._entry.entry_id, **info
+            )
 
     # -----------------------------
     #  DEVICE INFO (area + identifiers)
     # -----------------------------
-    @property
-    def device_info(self):
-        dev = self._cfg.get("device")
+    def _load_device_meta(self):
+        """Read the "device" block of _cfg into the metadata fields; return its device info."""
+        # a missing block shares one empty dict
+        dev_meta = self._cfg.get("device") or _NO_DEVICE
+        self._manufacturer = dev_meta.get("manufacturer", "Lytiva")
+        self._model = dev_meta.get("model", "Curtain")
+        self._area = dev_meta.get("suggested_area")
+        self._sw_version = dev_meta.get("sw_version")
+        self._hw_version = dev_meta.get("hw_version")
+        return self._build_device_info(dev_meta)
 
+    def _build_device_info(self, dev: Dict[str, Any]):
+        """Build device info from a discovery device block (HA reads _attr_device_info directly)."""
         # If no device provided → DO NOT create a device entry
         if not dev:
             return None
@@ -171,27 +210,6 @@ class LytivaCurtain(CoverEntity):
             info["suggested_area"] = self._area
         return info
 
-    # -----------------------------
-    #  BASIC PROPS
-    # -----------------------------
-    @property
-    def name(self) -> str:
-        return self._attr_name
-
-    @property
-    def unique_id(self) -> str:
-        return self._attr_unique_id
-
-    @property
-    def current_cover_position(self) -> Optional[int]:
-        return self._position
-
-    @property
-    def is_closed(self) -> Optional[bool]:
-        if self._position is None:
-            return None
-        return self._position == 0
-
     # -----------------------------
     #  MQTT PUBLISH HELPER
     # -----------------------------
@@ -205,7 +223,7 @@ class LytivaCurtain(CoverEntity):
                     payload["address"] = self.address
             mqtt = self.hass.data[DOMAIN][self._entry.entry_id]["mqtt_client"]
             topic = self._command_topic or f"LYT/{self.address}/CMD"
-            mqtt.publish(topic, json.dumps(payload))
+            mqtt.publish(topic, json_bytes(payload))
         except Exception as e:
             _LOGGER.exception("Lytiva Cover publish failed for %s: %s", self._attr_name, e)
 
@@ -247,20 +265,23 @@ class LytivaCurtain(CoverEntity):
                 return
 
             # if discovery provided a template, use it (expects "{{ position }}")
-            template = self._set_position_template or self._cfg.get("set_position_template") or ""
-            if template:
+            if self._set_position_parts is not None:
                 try:
-                    # replace placeholder with an integer position
-                    payload_text = template.replace("{{ position }}", str(int(pos)))
+                    # substitute the integer position into the pre-split template
+                    payload_text = str(int(pos)).join(self._set_position_parts)
                     # try parse dict, otherwise send raw text
                     try:
-                        payload = json.loads(payload_text)
+                        payload = json_loads(payload_text)
+                    except ValueError:
+                        payload = None
+                    if isinstance(payload, dict):
                         self._publish_payload(payload)
-                    except Exception:
+                    else:
                         mqtt = self.hass.data[DOMAIN][self._entry.entry_id]["mqtt_client"]
                         topic = self._command_topic or f"LYT/{self.address}/CMD"
                         mqtt.publish(topic, payload_text)
-                    _LOGGER.debug("Published set_position for %s -> %s", self._attr_name, payload_text)
+                    if _LOGGER.isEnabledFor(logging.DEBUG):
+                        _LOGGER.debug("Published set_position for %s -> %s", self._attr_name, payload_text)
                     return
                 except Exception:
                     _LOGGER.exception("Error applying set_position_template for %s", self._attr_name)
@@ -268,48 +289,65 @@ class LytivaCurtain(CoverEntity):
             # fallback: build a simple curtain payload with curtain_level
             payload = {"version": "v1.0", "type": "curtain", "address": self.address, "curtain_level": int(pos)}
             self._publish_payload(payload)
-            _LOGGER.debug("Published fallback set_position for %s -> %s", self._attr_name, payload)
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("Published fallback set_position for %s -> %s", self._attr_name, payload)
         except Exception as e:
             _LOGGER.exception("set_cover_position error for %s: %s", self._attr_name, e)
 
     # -----------------------------
     #  CENTRAL STATUS UPDATE (called from __init__.py handler)
     # -----------------------------
-    async def _update_from_payload(self, payload: Dict[str, Any]) -> None:
+    def _raw_status_unchanged(self, raw: bytes) -> bool:
+        """Bytes-level probe: True if the frame repeats the current curtain level.
+
+        Lets the central handler drop level heartbeats before decoding them. Only
+        a frame with one top-level "curtain" block holding the only curtain_level
+        is judged here; anything else (top-level level fields, several blocks,
+        non-integer values) falls through to the full parse.
+        """
+        if raw.count(b'"curtain_level"') != 1 or len(_CURTAIN_KEY_RE.findall(raw)) != 1:
+            return False
+        match = _LEVEL_RE.search(raw)
+        if match is None or not raw_in_outer_object(raw, match.start()):
+            return False
+        return int(match.group(1)) == self._attr_current_cover_position
+
+    @callback
+    def _update_from_payload(self, payload: Dict[str, Any]) -> None:
         try:
             # match by address (address may be int or string)
             inc = payload.get("address") or payload.get("unique_id")
             if inc is None:
                 return
-            try:
-                if str(inc) != str(self.address):
-                    return
-            except Exception:
+            if (inc if type(inc) is str else str(inc)) != self._address_str:
                 return
 
             # look for nested curtain.curtain_level or top-level curtain_level/position/level
-            level = None
-            if isinstance(payload.get("curtain"), dict):
-                level = payload["curtain"].get("curtain_level")
+            curtain = payload.get("curtain")
+            level = curtain.get("curtain_level") if type(curtain) is dict else None
             if level is None:
-                level = payload.get("curtain_level") or payload.get("position") or payload.get("level")
+                # explicit None checks: a fully closed curtain reports level 0
+                level = payload.get("curtain_level")
+                if level is None:
+                    level = payload.get("position")
+                    if level is None:
+                        level = payload.get("level")
 
             if level is not None:
                 try:
                     new_pos = int(level)
                 except Exception:
                     return
-                if new_pos != self._position:
-                    self._position = new_pos
-                    _LOGGER.debug("Curtain %s updated position -> %s", self._attr_name, self._position)
-                    try:
+                if new_pos != self._attr_current_cover_position:
+                    # HA reads both straight from _attr_*, no property calls per write
+                    self._attr_current_cover_position = new_pos
+                    self._attr_is_closed = new_pos == 0
+                    if _LOGGER.isEnabledFor(logging.DEBUG):
+                        _LOGGER.debug("Curtain %s updated position -> %s", self._attr_name, new_pos)
+                    # central updates always run on the hass loop; write directly
+                    # not added yet (batched add pending): HA writes the applied state on add
+                    if self.platform is not None:
                         self.async_write_ha_state()
-                    except Exception:
-                        # fallback scheduling
-                        try:
-                            self.schedule_update_ha_state()
-                        except Exception:
-                            pass
         except Exception as e:
             _LOGGER.exception("Lytiva Cover update error for %s: %s", self._attr_name, e)
 
@@ -317,14 +355,21 @@ class LytivaCurtain(CoverEntity):
 # -----------------------------
 #  HELPERS
 # -----------------------------
+def _split_position_template(template: Optional[str]) -> Optional[list]:
+    """Split a set_position_template around "{{ position }}" (None if there is none)."""
+    return template.split("{{ position }}") if template else None
+
+
 def _ensure_dict(val: Any) -> Dict[str, Any]:
     """Normalize payload that may be a JSON string or dict into a dict."""
     if isinstance(val, dict):
         return val
     try:
         if isinstance(val, str):
-            return json.loads(val)
-    except Exception:
+            parsed = json_loads(val)
+            if isinstance(parsed, dict):
+                return parsed
+    except ValueError:
         pass
     # last resort: return a dict-wrapped message
     return {"payload": val}
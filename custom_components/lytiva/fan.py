@@ -1,18 +1,20 @@
 """Lytiva Fan integration with live updates and HA-compatible control."""
 from __future__ import annotations
-import json
 import logging
 import math
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.components.fan import FanEntity, FanEntityFeature
 
-from . import DOMAIN
+from . import DOMAIN, batched_entity_adder
 
 _LOGGER = logging.getLogger(__name__)
 
+# shared stand-in for discovery payloads without a "device" block (read-only)
+_NO_DEVICE: dict = {}
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
     """Set up Lytiva fans from discovery or stored devices."""
@@ -20,9 +22,24 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     mqtt = data["mqtt_client"]
     devices = data.get("devices", {})
 
+    by_uid = data["entities_by_unique_id"]
+    by_addr = data["entities_by_address"]
+    add_entity = batched_entity_adder(hass, async_add_entities)
+
     def add_fan(device):
+        uid = str(device.get("unique_id") or device.get("address"))
+        if uid in by_uid:
+            # retained config replayed: the entity already exists and is indexed
+            return
         ent = LytivaFan(hass, entry, device)
-        async_add_entities([ent])
+        addr_key = str(ent._address)
+        if addr_key in by_addr:
+            # another entity already owns this address's STATUS routing
+            return
+        # the central STATUS handler finds the fan through these indexes
+        by_uid[uid] = ent
+        by_addr[addr_key] = ent
+        add_entity(ent)
         _LOGGER.info("✅ Lytiva fan added: %s (Address: %s)", device.get("name"), device.get("unique_id"))
 
     register_cb = data.get("register_fan_callback")
@@ -39,6 +56,7 @@ class LytivaFan(FanEntity):
     """Lytiva fan entity with live updates."""
 
     _attr_supported_features = FanEntityFeature.SET_SPEED | FanEntityFeature.TURN_ON | FanEntityFeature.TURN_OFF
+    _attr_speed_count = 4
 
     def __init__(self, hass, entry, device: dict[str, Any]):
         self.hass = hass
@@ -49,15 +67,23 @@ class LytivaFan(FanEntity):
         self._name = device.get("name")
         self._unique_id = str(device.get("unique_id") or device.get("address"))
         self._address = int(device.get("unique_id") or device.get("address"))
+        # fixed identity: read by HA as plain attributes
+        self._attr_name = self._name
+        self._attr_unique_id = self._unique_id
 
         self._state_topic = device.get("state_topic")
         self._command_topic = device.get("command_topic")
+        # constant head of every command payload; only fan_speed varies
+        self._command_prefix = b'{"version":"v1.0","type":"fan","address":%d,"fan_speed":' % self._address
 
-        dev_meta = device.get("device", {})
+        # device block read once; a missing block shares one empty dict
+        dev_meta = self._device.get("device") or _NO_DEVICE
         self._manufacturer = dev_meta.get("manufacturer", "Lytiva")
         self._model = dev_meta.get("model", "Fan")
         self._area = dev_meta.get("suggested_area")
 
+        self._attr_device_info = self._build_device_info(dev_meta)
+
         # Internal state
         self._available = True
         self._speed = 0
@@ -65,53 +91,40 @@ class LytivaFan(FanEntity):
         self._last_speed = 3
         self._is_on = False
 
-        self._subscribe_state()
-
     # ---------------------------------------------------------
-    #  MQTT STATUS SUBSCRIPTION
+    #  CENTRAL STATUS UPDATE (called from __init__.py handler)
     # ---------------------------------------------------------
-    def _subscribe_state(self):
-        if not self._state_topic:
-            return
-
-        def _cb(client, userdata, msg):
-            try:
-                payload = json.loads(msg.payload.decode())
-                if payload.get("address") != self._address:
-                    return
-
-                fan_data = payload.get("fan", {})
-                speed = fan_data.get("fan_speed", payload.get("fan_speed"))
-                if speed is not None:
-                    speed = max(0, min(4, int(speed)))
-                    self._speed = speed
-                    self._percentage = speed * 25
-                    if speed > 0:
-                        self._last_speed = speed
-                    self._is_on = speed > 0
-                    self._available = True
-                    self.schedule_update_ha_state()
-            except Exception as e:
-                _LOGGER.error("Error processing fan state: %s", e)
-
-        self._mqtt.message_callback_add(self._state_topic, _cb)
-        self._mqtt.subscribe(self._state_topic)
-        _LOGGER.debug("Subscribed to fan state topic: %s", self._state_topic)
+    @callback
+    def _update_from_payload(self, payload: dict):
+        """Apply a STATUS payload routed here by address (runs on the hass loop)."""
+        try:
+            if payload.get("address") != self._address:
+                return
+
+            fan_data = payload.get("fan")
+            if fan_data is not None and "fan_speed" in fan_data:
+                speed = fan_data["fan_speed"]
+            else:
+                speed = payload.get("fan_speed")
+            if speed is not None:
+                speed = max(0, min(4, int(speed)))
+                self._speed = speed
+                self._percentage = speed * 25
+                if speed > 0:
+                    self._last_speed = speed
+                self._is_on = speed > 0
+                self._available = True
+                # not added yet (batched add pending): HA writes the applied state on add
+                if self.platform is not None:
+                    self.async_write_ha_state()
+        except Exception as e:
+            _LOGGER.error("Error processing fan state: %s", e)
 
     # ---------------------------------------------------------
     #  HA PROPERTIES
     # ---------------------------------------------------------
-    @property
-    def name(self):
-        return self._name
-
-    @property
-    def unique_id(self):
-        return self._unique_id
-
-    @property
-    def device_info(self):
-        dev = self._device.get("device")
+    def _build_device_info(self, dev: dict[str, Any]):
+        """Build device info once from discovery (HA reads _attr_device_info directly)."""
         if not dev:  # Skip device creation for group entities
             return None
 
@@ -143,10 +156,6 @@ class LytivaFan(FanEntity):
     def percentage(self):
         return self._percentage
 
-    @property
-    def speed_count(self):
-        return 4
-
     # ---------------------------------------------------------
     #  CONTROL METHODS
     # ---------------------------------------------------------
@@ -170,20 +179,44 @@ class LytivaFan(FanEntity):
 
     async def _set_speed(self, speed: int):
         """Publish MQTT payload and update internal state."""
-        payload = {
-            "version": "v1.0",
-            "type": "fan",
-            "address": self._address,
-            "fan_speed": speed
-        }
         if self._command_topic:
-            self._mqtt.publish(self._command_topic, json.dumps(payload))
+            self._mqtt.publish(self._command_topic, self._command_prefix + b"%d}" % speed)
+            self.hass.data[DOMAIN][self._entry.entry_id]["forget_status"](self._address)
 
         self._speed = speed
         self._percentage = speed * 25
         self._last_speed = speed if speed > 0 else self._last_speed
         self._is_on = speed > 0
-        self.schedule_update_ha_state()
+        self.async_write_ha_state()
+
+    # ---------------------------------------------------------
+    #  TEARDOWN
+    # ---------------------------------------------------------
+    def _unindex(self):
+        """Drop this fan from the central STATUS indexes."""
+        store = self.hass.data[DOMAIN].get(self._entry.entry_id)
+        if not store:
+            return
+        for index, key in (
+            (store["entities_by_unique_id"], self._unique_id),
+            (store["entities_by_address"], str(self._address)),
+        ):
+            # only if the key still points at this entity (not a re-discovered one)
+            if index.get(key) is self:
+                del index[key]
+        # per-key STATUS state: an entity re-created on this address must apply the
+        # next frame even if it is byte-identical to the last one seen here
+        updaters = store["entity_updaters"]
+        for key in (self._unique_id, str(self._address)):
+            cached = updaters.get(key)
+            if cached is not None and cached[0] is self:
+                del updaters[key]
+        store["forget_status"](self._address)
+
+    async def async_will_remove_from_hass(self):
+        """Unindex the fan so a removed entity stops receiving STATUS."""
+        self._unindex()
+        await super().async_will_remove_from_hass()
 
     # ---------------------------------------------------------
     #  RESTORE OLD STATE
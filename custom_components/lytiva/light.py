@@ -1,7 +1,6 @@
 """Lytiva lights via MQTT (stable + HA compatible + area support)."""
 from __future__ import annotations
 import logging
-import json
 from typing import Any, Dict
 
 from homeassistant.components.light import (
@@ -12,12 +11,39 @@ from homeassistant.components.light import (
     ColorMode,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.json import json_bytes
 
-from . import DOMAIN
+from . import DOMAIN, batched_entity_adder
 
 _LOGGER = logging.getLogger(__name__)
 
+# STATUS bursts for one light inside this window (seconds) share a single state write
+UPDATE_DEBOUNCE = 0.05
+
+# variable tail of each light type's command payload (the head is built per light)
+_COMMAND_TAILS = {
+    "dimmer": b',"dimming":%d}',
+    "cct": b',"dimming":%d,"color_temperature":%d}',
+    "rgb": b',"r":%d,"g":%d,"b":%d}',
+}
+
+# device dimming percent (0-100) -> HA brightness (0-255), computed once
+_DIM_TO_BRIGHTNESS = tuple(round(d * 255 / 100) for d in range(101))
+
+# HA brightness -> percent factor; b * _BRIGHTNESS_TO_PERCENT truncates/rounds exactly
+# like b * 100 / 255 for every b in 0..255
+_BRIGHTNESS_TO_PERCENT = 100 / 255
+
+
+def _brightness(dim) -> int:
+    """HA brightness for a reported dimming percent, clamped to 0-100."""
+    if type(dim) is int:
+        return _DIM_TO_BRIGHTNESS[0 if dim < 0 else 100 if dim > 100 else dim]
+    # fractional (or numeric string) percent: scale and round it like the table does
+    dim = float(dim)
+    return round((0.0 if dim < 0 else 100.0 if dim > 100 else dim) * 255 / 100)
+
 
 # ---------------------------------------------------------
 #  REGISTER DISCOVERY CALLBACK
@@ -27,20 +53,23 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     register_cb = data.get("register_light_callback")
 
     if register_cb:
-        register_cb(lambda payload: _handle_discovery(hass, entry, payload, async_add_entities))
+        add_entity = batched_entity_adder(hass, async_add_entities)
+        register_cb(lambda payload: _handle_discovery(hass, entry, payload, add_entity))
         _LOGGER.debug("Lytiva Light: discovery callback registered.")
 
 
 # ---------------------------------------------------------
 #  DISCOVERY HANDLER
 # ---------------------------------------------------------
-def _handle_discovery(hass, entry, payload, async_add_entities):
+def _handle_discovery(hass, entry, payload, add_entity):
     try:
         uid = payload.get("unique_id") or payload.get("address")
         if uid is None:
             return
 
-        uid = str(uid)
+        # JSON ids are usually str already; only numeric ones (address fallback) need coercing
+        if type(uid) is not str:
+            uid = str(uid)
 
         # FIX: If address missing, use unique_id as address
         if "address" not in payload or payload.get("address") is None:
@@ -61,7 +90,7 @@ def _handle_discovery(hass, entry, payload, async_add_entities):
         by_uid[uid] = ent
         by_addr[str(ent.address)] = ent
 
-        hass.add_job(async_add_entities, [ent])
+        add_entity(ent)
 
     except Exception as e:
         _LOGGER.exception("Lytiva Light discovery failed: %s", e)
@@ -77,6 +106,10 @@ class LytivaLight(LightEntity):
         self.hass = hass
         self._entry = entry
         self._cfg = cfg or {}
+        # entry-scoped and fixed: resolved once instead of per publish
+        store = hass.data[DOMAIN][entry.entry_id]
+        self._mqtt = store["mqtt_client"]
+        self._forget_status = store["forget_status"]
 
         # Identity
         self._attr_name = cfg.get("name", "Lytiva Light")
@@ -87,10 +120,12 @@ class LytivaLight(LightEntity):
 
         try:
             self.address = int(addr)
-        except:
+        except (TypeError, ValueError):
             self.address = addr
 
         self.command_topic = cfg.get("command_topic")
+        self._pending_write_handle = None
+        self._removed = False
 
         # Default internal state
         self._attr_is_on = False
@@ -101,6 +136,7 @@ class LytivaLight(LightEntity):
         self._attr_min_mireds = cfg.get("min_mireds", 154)
         self._attr_max_mireds = cfg.get("max_mireds", 370)
         self._attr_color_temp = self._attr_min_mireds
+        self._mired_span = self._attr_max_mireds - self._attr_min_mireds
 
         # Type detect
         typ = cfg.get("type", "")
@@ -112,6 +148,18 @@ class LytivaLight(LightEntity):
         else:
             self.light_type = "dimmer"
 
+        # command payloads are one bytes %-format: only the numbers vary per call
+        self._command_fmt = (
+            b'{"version":"v1.0","address":%s,"type":"%s"'
+            % (json_bytes(self.address).replace(b"%", b"%%"), self.light_type.encode())
+            + _COMMAND_TAILS[self.light_type]
+        )
+        # off command never varies: every field zero (dimming [+ colour temp], or r/g/b)
+        self._off_payload = self._command_fmt % ((0,) * _COMMAND_TAILS[self.light_type].count(b"%d"))
+        # light_type is fixed: bind its STATUS and turn_on handlers once
+        self._apply_status = getattr(self, f"_apply_status_{self.light_type}")
+        self._on_values = getattr(self, f"_on_values_{self.light_type}")
+
         # Supported modes
         if self.light_type == "cct":
             self._attr_supported_color_modes = {ColorMode.COLOR_TEMP, ColorMode.BRIGHTNESS}
@@ -152,13 +200,47 @@ class LytivaLight(LightEntity):
 
         return info
 
+    # ---------------------------------------------------------
+    #  TEARDOWN
+    # ---------------------------------------------------------
+    def _unindex(self):
+        """Drop this light from the central STATUS indexes."""
+        store = self.hass.data[DOMAIN].get(self._entry.entry_id)
+        if not store:
+            return
+        for index, key in (
+            (store["entities_by_unique_id"], self._attr_unique_id),
+            (store["entities_by_address"], str(self.address)),
+        ):
+            # only if the key still points at this entity (not a re-discovered one)
+            if index.get(key) is self:
+                del index[key]
+        # per-key STATUS state: an entity re-created on this address must apply the
+        # next frame even if it is byte-identical to the last one seen here
+        updaters = store["entity_updaters"]
+        for key in (self._attr_unique_id, str(self.address)):
+            cached = updaters.get(key)
+            if cached is not None and cached[0] is self:
+                del updaters[key]
+        store["forget_status"](self.address)
+
+    async def async_will_remove_from_hass(self):
+        """Drop a pending debounced write and unindex the light."""
+        self._removed = True
+        if self._pending_write_handle is not None:
+            self._pending_write_handle.cancel()
+            self._pending_write_handle = None
+        self._unindex()
+        await super().async_will_remove_from_hass()
+
     # ---------------------------------------------------------
     #  MQTT PUBLISH
     # ---------------------------------------------------------
-    def _publish(self, payload):
+    def _publish(self, data: bytes):
         try:
-            mqtt = self.hass.data[DOMAIN][self._entry.entry_id]["mqtt_client"]
-            mqtt.publish(self.command_topic, json.dumps(payload))
+            self._mqtt.publish(self.command_topic, data)
+            # state is set optimistically; let the next STATUS through even if unchanged
+            self._forget_status(self.address)
         except Exception as e:
             _LOGGER.error("Light MQTT publish error: %s", e)
 
@@ -166,104 +248,107 @@ class LytivaLight(LightEntity):
     #  TURN ON
     # ---------------------------------------------------------
     async def async_turn_on(self, **kwargs):
-        payload = {"version": "v1.0", "address": self.address}
-
-        if self.light_type == "dimmer":
-            b = kwargs.get(ATTR_BRIGHTNESS, getattr(self, "_last_brightness", 255))
-            self._attr_brightness = b
-            payload.update({"type": "dimmer", "dimming": int(b * 100 / 255)})
-
-        elif self.light_type == "cct":
-            b = kwargs.get(ATTR_BRIGHTNESS, getattr(self, "_last_brightness", 255))
-            t = kwargs.get(ATTR_COLOR_TEMP, getattr(self, "_last_color_temp", self._attr_min_mireds))
-            self._attr_brightness = b
-            self._attr_color_temp = t
-
-            dim = round(b * 100 / 255)
-            ct_scaled = int((t - self._attr_min_mireds) * 100 /
-                            (self._attr_max_mireds - self._attr_min_mireds))
-            ct_scaled = 100 - ct_scaled
-
-            payload.update({
-                "type": "cct",
-                "dimming": dim,
-                "color_temperature": ct_scaled
-            })
+        self._attr_is_on = True
+        self._publish(self._command_fmt % self._on_values(kwargs))
+        self.async_write_ha_state()
 
-        elif self.light_type == "rgb":
-            r, g, b = kwargs.get(ATTR_RGB_COLOR, getattr(self, "_last_rgb", [255, 255, 255]))
-            self._attr_rgb_color = [r, g, b]
-            payload.update({"type": "rgb", "r": r, "g": g, "b": b})
+    def _on_values_dimmer(self, kwargs):
+        b = kwargs.get(ATTR_BRIGHTNESS, getattr(self, "_last_brightness", 255))
+        self._attr_brightness = b
+        return (int(b * _BRIGHTNESS_TO_PERCENT),)
 
+    def _on_values_cct(self, kwargs):
+        b = kwargs.get(ATTR_BRIGHTNESS, getattr(self, "_last_brightness", 255))
+        t = kwargs.get(ATTR_COLOR_TEMP, getattr(self, "_last_color_temp", self._attr_min_mireds))
+        self._attr_brightness = b
+        self._attr_color_temp = t
 
-        self._attr_is_on = True
-        self._publish(payload)
-        self.async_write_ha_state()
+        dim = round(b * _BRIGHTNESS_TO_PERCENT)
+        ct_scaled = int((t - self._attr_min_mireds) * 100 / self._mired_span)
+        return (dim, 100 - ct_scaled)
+
+    def _on_values_rgb(self, kwargs):
+        r, g, b = kwargs.get(ATTR_RGB_COLOR, getattr(self, "_last_rgb", [255, 255, 255]))
+        self._attr_rgb_color = [r, g, b]
+        return (r, g, b)
 
     # ---------------------------------------------------------
     #  TURN OFF
     # ---------------------------------------------------------
     async def async_turn_off(self, **kwargs):
-        payload = {"version": "v1.0", "address": self.address}
-
         # store last state
         self._last_brightness = self._attr_brightness
         self._last_color_temp = self._attr_color_temp
         self._last_rgb = self._attr_rgb_color.copy()
 
-        if self.light_type == "dimmer":
-            payload.update({"type": "dimmer", "dimming": 0})
-
-        elif self.light_type == "cct":
-            payload.update({"type": "cct", "dimming": 0, "color_temperature": 0})
-
-        elif self.light_type == "rgb":
-            payload.update({"type": "rgb", "r": 0, "g": 0, "b": 0})
-
         self._attr_is_on = False
-        self._publish(payload)
+        self._publish(self._off_payload)
         self.async_write_ha_state()
 
+    @callback
+    def _queue_write(self):
+        """Schedule one debounced state write; further frames inside the window ride along."""
+        # not added yet (batched add pending): HA writes the applied state on add
+        if self._pending_write_handle is None and not self._removed and self.platform is not None:
+            self._pending_write_handle = self.hass.loop.call_later(UPDATE_DEBOUNCE, self._flush_write)
+
+    @callback
+    def _flush_write(self):
+        self._pending_write_handle = None
+        # a timer can outlive the entity; never write state for a removed light
+        if self._removed:
+            return
+        try:
+            self.async_write_ha_state()
+        except Exception as e:
+            _LOGGER.exception("Light state write error: %s", e)
+
     # ---------------------------------------------------------
     #  UPDATE FROM DEVICE PAYLOAD
     # ---------------------------------------------------------
-    async def _update_from_payload(self, payload):
+    @callback
+    def _update_from_payload(self, payload):
+        """Apply a STATUS payload routed here by address (runs on the hass loop).
+
+        Called inline by the central STATUS drain, so a burst for one light is
+        applied frame after frame in a single loop pass instead of spawning a
+        task per frame that all race to write state.
+        """
         try:
             if payload.get("address") != self.address:
                 return
-
-            if self.light_type == "dimmer":
-                d = payload.get("dimmer", {}).get("dimming") or payload.get("dimming")
-                if d is not None:
-                    self._attr_brightness = round(d * 255 / 100)
-                    self._attr_is_on = d > 0
-
-            elif self.light_type == "cct":
-                c = payload.get("cct")
-                if isinstance(c, dict):
-                    d = c.get("dimming")
-                    t = c.get("color_temperature")
-
-                    if d is not None:
-                        self._attr_brightness = round(d * 255 / 100)
-                        self._attr_is_on = d > 0
-
-                    if t is not None:
-                        self._attr_color_temp = round(
-                            self._attr_max_mireds -
-                            (t * (self._attr_max_mireds - self._attr_min_mireds) / 100)
-                        )
-
-            elif self.light_type == "rgb":
-                rgb = payload.get("rgb")
-                if isinstance(rgb, dict):
-                    r = rgb.get("r", 0)
-                    g = rgb.get("g", 0)
-                    b = rgb.get("b", 0)
-                    self._attr_rgb_color = [r, g, b]
-                    self._attr_is_on = any([r, g, b])
-
-            self.async_write_ha_state()
-
+            before = (self._attr_is_on, self._attr_brightness, self._attr_color_temp, self._attr_rgb_color)
+            self._apply_status(payload)
+            # heartbeats usually repeat the current state: no write for those
+            if before != (self._attr_is_on, self._attr_brightness, self._attr_color_temp, self._attr_rgb_color):
+                self._queue_write()
         except Exception as e:
             _LOGGER.exception("Light update error: %s", e)
+
+    def _apply_status_dimmer(self, payload):
+        d = payload.get("dimmer", {}).get("dimming") or payload.get("dimming")
+        if d is not None:
+            self._attr_brightness = _brightness(d)
+            self._attr_is_on = d > 0
+
+    def _apply_status_cct(self, payload):
+        c = payload.get("cct")
+        if isinstance(c, dict):
+            d = c.get("dimming")
+            t = c.get("color_temperature")
+
+            if d is not None:
+                self._attr_brightness = _brightness(d)
+                self._attr_is_on = d > 0
+
+            if t is not None:
+                self._attr_color_temp = round(self._attr_max_mireds - t * self._mired_span / 100)
+
+    def _apply_status_rgb(self, payload):
+        rgb = payload.get("rgb")
+        if isinstance(rgb, dict):
+            r = rgb.get("r", 0)
+            g = rgb.get("g", 0)
+            b = rgb.get("b", 0)
+            self._attr_rgb_color = [r, g, b]
+            self._attr_is_on = any([r, g, b])
@@ -1,13 +1,14 @@
 """Lytiva Scene platform."""
 from __future__ import annotations
 import logging
-import json
+from functools import partial
+
 from homeassistant.components.scene import Scene
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers import device_registry as dr, area_registry as ar
-from . import DOMAIN
+from . import DOMAIN, batched_entity_adder
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -15,13 +16,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     """Set up Lytiva scenes from a config entry."""
     data = hass.data[DOMAIN][entry.entry_id]
     mqtt = data["mqtt_client"]
-    discovery_prefix = data["discovery_prefix"]
     
     scenes: list[LytivaScene] = []
+    # discovery unique_ids already turned into entities (payload form, not the entity's prefixed id)
+    scene_ids: set[str] = set()
+    add_entity = batched_entity_adder(hass, async_add_entities)
+
+    def forget_scene(scene: LytivaScene) -> None:
+        """Release a removed scene so its config can be discovered again."""
+        scene_ids.discard(scene._unique_id)
+        if scene in scenes:
+            scenes.remove(scene)
     
-    def on_message(client, userdata, msg):
+    def on_message(payload: dict):
+        """Handle a scene discovery payload routed by the central MQTT handler."""
         try:
-            payload = json.loads(msg.payload.decode())
             name = payload.get("name")
             unique_id = str(payload.get("unique_id"))
             command_topic = payload.get("command_topic")
@@ -34,7 +43,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
                 return
             
             # Avoid duplicates
-            if unique_id in [s.unique_id for s in scenes]:
+            if unique_id in scene_ids:
                 return
             
             _LOGGER.info("🧩 Discovered Lytiva scene: %s (%s) in area: %s", name, unique_id, suggested_area)
@@ -47,75 +56,103 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
                 payload_on, 
                 mqtt,
                 suggested_area,
-                device_info
+                device_info,
+                data["scene_state_routes"],
+                forget_scene,
             )
             scenes.append(scene_entity)
-            hass.loop.call_soon_threadsafe(async_add_entities, [scene_entity])
+            scene_ids.add(unique_id)
+            add_entity(scene_entity)
             
         except Exception as e:
             _LOGGER.error("Error parsing Lytiva scene config: %s", e)
     
-    # Subscribe to discovery messages
-    topic = f"{discovery_prefix}/scene/+/config"
-    _LOGGER.info("📡 Subscribing to Lytiva scenes on %s", topic)
-    mqtt.subscribe(topic)
-    mqtt.message_callback_add(topic, on_message)
+    # Scene configs arrive on the central {discovery_prefix}/+/+/config subscription
+    _LOGGER.info("📡 Listening for Lytiva scenes on %s/scene/+/config", data["discovery_prefix"])
+    register_cb = data.get("register_scene_callback")
+    if register_cb:
+        register_cb(on_message)
+
+
+def _dispatch_scene_state(routes: dict, topic: str, client, userdata, msg) -> None:
+    """Fan one state message out to every scene on this topic (paho thread)."""
+    for scene in routes.get(topic, ()):
+        scene._on_state_message(client, userdata, msg)
 
 
 class LytivaScene(Scene):
     """Representation of a Lytiva MQTT Scene."""
-    
-    def __init__(self, name, unique_id, command_topic, state_topic, payload_on, mqtt_client, suggested_area=None, device_info=None):
+
+    def __init__(self, name, unique_id, command_topic, state_topic, payload_on, mqtt_client, suggested_area=None, device_info=None, state_routes=None, on_remove=None):
         self._name = name
         self._unique_id = unique_id
         self._command_topic = command_topic
         self._state_topic = state_topic
         self._payload_on = payload_on
         self._mqtt = mqtt_client
-        self._available = True
         self._suggested_area = suggested_area
-        self._device_info = device_info
+        self._state_routes = state_routes if state_routes is not None else {}
+        # setup's hook: frees the discovery id when the entity goes away
+        self._on_remove = on_remove
+
+        # fixed identity, built once: HA reads these as plain attributes
+        self._attr_name = name
+        self._attr_unique_id = f"lytiva_scene_{unique_id}"
+        self._attr_available = True
+        self._attr_device_info = None
+        if device_info:
+            # link this scene to a device/room
+            self._attr_device_info = {
+                "identifiers": {(DOMAIN, device_info.get("identifiers", [None])[0])},
+                "name": device_info.get("name"),
+                "manufacturer": device_info.get("manufacturer", "Lytiva"),
+                "model": device_info.get("model", "Scene Controller"),
+                "suggested_area": device_info.get("suggested_area"),
+            }
         
         # Listen to state topic to mark availability
         if self._state_topic:
-            self._mqtt.subscribe(self._state_topic)
-            self._mqtt.message_callback_add(self._state_topic, self._on_state_message)
-    
-    @property
-    def name(self) -> str:
-        return self._name
-    
-    @property
-    def unique_id(self) -> str:
-        return f"lytiva_scene_{self._unique_id}"
-    
-    @property
-    def available(self) -> bool:
-        return self._available
-    
+            self._add_state_route()
+
+    def _add_state_route(self):
+        """Join the scenes on this state topic; the first one subscribes for all."""
+        routes = self._state_routes
+        topic = self._state_topic
+        scenes = routes.get(topic)
+        if scenes is None:
+            # paho keeps one callback per topic filter: register a dispatcher, not the scene
+            self._mqtt.message_callback_add(topic, partial(_dispatch_scene_state, routes, topic))
+            self._mqtt.subscribe(topic)
+            scenes = ()
+        # tuples replaced on write, so the paho thread iterates them without a copy
+        routes[topic] = scenes + (self,)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Leave the state topic route; the last scene on it drops the subscription."""
+        topic = self._state_topic
+        scenes = self._state_routes.get(topic) if topic else None
+        if scenes:
+            remaining = tuple(scene for scene in scenes if scene is not self)
+            if remaining:
+                self._state_routes[topic] = remaining
+            else:
+                del self._state_routes[topic]
+                self._mqtt.message_callback_remove(topic)
+                self._mqtt.unsubscribe(topic)
+        if self._on_remove is not None:
+            self._on_remove(self)
+        await super().async_will_remove_from_hass()
+
     @property
     def suggested_area(self) -> str | None:
         """Return the suggested area for this scene."""
         return self._suggested_area
     
-    @property
-    def device_info(self):
-        """Return device info to link this scene to a device/room."""
-        if self._device_info:
-            return {
-                "identifiers": {(DOMAIN, self._device_info.get("identifiers", [None])[0])},
-                "name": self._device_info.get("name"),
-                "manufacturer": self._device_info.get("manufacturer", "Lytiva"),
-                "model": self._device_info.get("model", "Scene Controller"),
-                "suggested_area": self._device_info.get("suggested_area"),
-            }
-        return None
-    
     def _on_state_message(self, client, userdata, msg):
         try:
-            payload = msg.payload.decode()
-            _LOGGER.debug("Scene %s state update: %s", self._name, payload)
-            self._available = True
+            # raw bytes are only formatted if debug logging is enabled
+            _LOGGER.debug("Scene %s state update: %r", self._name, msg.payload)
+            self._attr_available = True
         except Exception as e:
             _LOGGER.error("Error handling scene state: %s", e)
     
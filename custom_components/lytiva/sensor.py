@@ -1,13 +1,12 @@
 """Lytiva sensors via MQTT with live updates via central STATUS handler (generic)."""
 from __future__ import annotations
 import logging
-import json
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import DOMAIN
+from . import DOMAIN, batched_entity_adder, shared_device_info
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,6 +25,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     store = hass.data[DOMAIN][entry.entry_id]
     by_uid = store["entities_by_unique_id"]
     by_addr = store["entities_by_address"]
+    add_entity = batched_entity_adder(hass, async_add_entities)
 
     # register callback
     def _sensor_discovery(payload: dict):
@@ -37,10 +37,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
         by_uid[uid] = sensor
         by_addr[str(sensor.address)] = sensor
 
-        hass.add_job(async_add_entities, [sensor])
+        add_entity(sensor)
         _LOGGER.info("Discovered Lytiva sensor: %s", sensor.name)
 
-    store.setdefault("sensor_callbacks", []).append(lambda payload: hass.async_create_task(_sensor_discovery(payload)))
+    store["register_sensor_callback"](_sensor_discovery)
 
 class LytivaSensor(SensorEntity):
     """MQTT Sensor with live updates via central STATUS (generic)."""
@@ -59,25 +59,23 @@ class LytivaSensor(SensorEntity):
         # Address
         try:
             self.address = int(cfg.get("address") or self._attr_unique_id)
-        except Exception:
+        except (TypeError, ValueError):
             self.address = self._attr_unique_id
 
         self._device_class = cfg.get("device_class")
         self._unit_of_measurement = cfg.get("unit_of_measurement")
-        self._icon = cfg.get("icon") or DEFAULT_ICONS.get(self._device_class, DEFAULT_ICONS["default"])
+        # fixed per entity: HA reads _attr_icon directly
+        self._attr_icon = cfg.get("icon") or DEFAULT_ICONS.get(self._device_class) or DEFAULT_ICONS["default"]
 
         device_info = cfg.get("device", {})
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, str(device_info.get("identifiers", [self._attr_unique_id])[0]))},
-            "name": device_info.get("name", self._attr_name),
-            "manufacturer": device_info.get("manufacturer", "Lytiva"),
-            "model": device_info.get("model", "Sensor"),
-            "suggested_area": device_info.get("suggested_area", "Unknown"),
-        }
-
-    @property
-    def icon(self):
-        return self._icon
+        self._attr_device_info = shared_device_info(
+            hass.data[DOMAIN][entry_id],
+            str(device_info.get("identifiers", [self._attr_unique_id])[0]),
+            device_info.get("name", self._attr_name),
+            device_info.get("manufacturer", "Lytiva"),
+            device_info.get("model", "Sensor"),
+            device_info.get("suggested_area", "Unknown"),
+        )
 
     @property
     def native_value(self):
@@ -95,7 +93,8 @@ class LytivaSensor(SensorEntity):
     def device_class(self):
         return self._device_class
 
-    async def _update_from_payload(self, payload: dict):
+    @callback
+    def _update_from_payload(self, payload: dict):
         """Update sensor state from shared STATUS topic (generic)."""
         try:
             if str(payload.get("address")) != str(self.address):
@@ -115,9 +114,12 @@ class LytivaSensor(SensorEntity):
             self._state = sensor_data.get(numeric_keys[0]) if numeric_keys else None
 
             # attributes: all other keys
-            self._attributes = {k: v for k, v in sensor_data.items() if k != numeric_keys[0]} if numeric_keys else sensor_data
+            # always a fresh dict: sensor_data belongs to a payload shared by the decode cache
+            self._attributes = {k: v for k, v in sensor_data.items() if k != numeric_keys[0]} if numeric_keys else dict(sensor_data)
 
-            self.async_write_ha_state()
+            # not added yet (batched add pending): HA writes the applied state on add
+            if self.platform is not None:
+                self.async_write_ha_state()
 
         except Exception as e:
             _LOGGER.exception("Sensor update failed: %s", e)
@@ -1,17 +1,23 @@
 """Lytiva switches via MQTT (live updates + HA compatible + group support)."""
 from __future__ import annotations
 import logging
-import json
+import re
 from typing import Any, Dict
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.json import json_bytes
 
-from . import DOMAIN
+from . import DOMAIN, batched_entity_adder, raw_in_outer_object, shared_device_info
 
 _LOGGER = logging.getLogger(__name__)
 
+# switch.power in a raw STATUS frame: a JSON bool or bare integer field of the "switch"
+# object itself, ahead of anything nested in it (see _raw_status_unchanged)
+_SWITCH_KEY_RE = re.compile(rb'"switch"\s*:')
+_POWER_RE = re.compile(rb'"switch"\s*:\s*\{[^{}\[\]]*?"power"\s*:\s*(true|false|0|[1-9]\d*)\s*[,}]')
+
 
 # ---------------------------------------------------------
 #  REGISTER DISCOVERY CALLBACK
@@ -21,20 +27,23 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     register_cb = data.get("register_switch_callback")
 
     if register_cb:
-        register_cb(lambda payload: _handle_discovery(hass, entry, payload, async_add_entities))
+        add_entity = batched_entity_adder(hass, async_add_entities)
+        register_cb(lambda payload: _handle_discovery(hass, entry, payload, add_entity))
         _LOGGER.debug("Lytiva Switch: discovery callback registered.")
 
 
 # ---------------------------------------------------------
 #  DISCOVERY HANDLER
 # ---------------------------------------------------------
-def _handle_discovery(hass, entry, payload, async_add_entities):
+def _handle_discovery(hass, entry, payload, add_entity):
     try:
         uid = payload.get("unique_id") or payload.get("address")
         if uid is None:
             return
 
-        uid = str(uid)
+        # JSON ids are usually str already; only numeric ones (address fallback) need coercing
+        if type(uid) is not str:
+            uid = str(uid)
 
         # FIX: If address missing, use unique_id
         if "address" not in payload or payload.get("address") is None:
@@ -54,14 +63,8 @@ def _handle_discovery(hass, entry, payload, async_add_entities):
         by_uid[uid] = ent
         by_addr[str(ent.address)] = ent
 
-        # Register MQTT live update
-        mqtt = store.get("mqtt_client")
-        if mqtt:
-            topic = payload.get("status_topic")
-            if topic:
-                mqtt.subscribe(topic, lambda msg: hass.add_job(ent._update_from_payload, msg))
-
-        hass.add_job(async_add_entities, [ent])
+        # live updates: the central STATUS subscription routes frames here by address
+        add_entity(ent)
 
     except Exception as e:
         _LOGGER.exception("Lytiva Switch discovery failed: %s", e)
@@ -77,6 +80,10 @@ class LytivaSwitch(SwitchEntity):
         self.hass = hass
         self._entry = entry
         self._cfg = cfg or {}
+        # entry-scoped and fixed: resolved once instead of per publish
+        store = hass.data[DOMAIN][entry.entry_id]
+        self._mqtt = store["mqtt_client"]
+        self._forget_status = store["forget_status"]
 
         # Identity
         self._attr_name = cfg.get("name", "Lytiva Switch")
@@ -86,48 +93,59 @@ class LytivaSwitch(SwitchEntity):
         addr = cfg.get("address") or self._attr_unique_id
         try:
             self.address = int(addr)
-        except Exception:
+        except (TypeError, ValueError):
             self.address = addr
 
         self.command_topic = cfg.get("command_topic")
         self._attr_is_on = False
 
+        # on/off commands never vary: encode them once
+        self._payload_on = self._command_bytes(cfg.get("payload_on"), True)
+        self._payload_off = self._command_bytes(cfg.get("payload_off"), False)
+
+        self._attr_device_info = self._build_device_info(store, self._cfg.get("device"))
+
+    def _command_bytes(self, configured, power: bool) -> bytes:
+        """Wire bytes for a configured payload_on/off, or the default power command."""
+        if isinstance(configured, str):
+            # already JSON text from discovery: publish as-is instead of parse + re-dump
+            return configured.encode()
+        if isinstance(configured, dict):
+            return json_bytes(configured)
+        return json_bytes({"address": self.address, "type": "switch", "power": power, "version": "v1.0"})
+
     # ---------------------------------------------------------
     #  DEVICE INFO (area support)
     # ---------------------------------------------------------
-    @property
-    def device_info(self):
-        dev = self._cfg.get("device")
-
+    def _build_device_info(self, store, dev):
+        """Device info from discovery, built once (HA reads _attr_device_info directly)."""
         # If no device provided → DO NOT create a device entry
         if not dev:
             return None
 
         identifiers = dev.get("identifiers")
         if isinstance(identifiers, list) and identifiers:
-            identifiers = {(DOMAIN, identifiers[0])}
+            identifier = identifiers[0]
         else:
-            identifiers = {(DOMAIN, self._attr_unique_id)}
-
-        info = {
-            "identifiers": identifiers,
-            "name": dev.get("name", self._attr_name),
-            "manufacturer": dev.get("manufacturer", "Lytiva"),
-            "model": dev.get("model", "Switch"),
-        }
-
-        if dev.get("suggested_area"):
-            info["suggested_area"] = dev["suggested_area"]
+            identifier = self._attr_unique_id
 
-        return info
+        return shared_device_info(
+            store,
+            identifier,
+            dev.get("name", self._attr_name),
+            dev.get("manufacturer", "Lytiva"),
+            dev.get("model", "Switch"),
+            dev.get("suggested_area") or None,
+        )
 
     # ---------------------------------------------------------
     #  MQTT PUBLISH
     # ---------------------------------------------------------
-    def _publish(self, payload):
+    def _publish(self, data: bytes):
         try:
-            mqtt = self.hass.data[DOMAIN][self._entry.entry_id]["mqtt_client"]
-            mqtt.publish(self.command_topic, json.dumps(payload))
+            self._mqtt.publish(self.command_topic, data)
+            # state is set optimistically; let the next STATUS through even if unchanged
+            self._forget_status(self.address)
         except Exception as e:
             _LOGGER.error("Switch MQTT publish error: %s", e)
 
@@ -135,23 +153,38 @@ class LytivaSwitch(SwitchEntity):
     #  TURN ON / OFF
     # ---------------------------------------------------------
     async def async_turn_on(self, **kwargs):
-        payload = json.loads(self._cfg.get("payload_on") or {"address":54058,"type":"switch","power":true,"version":"v1.0"})
         self._attr_is_on = True
-        self._publish(payload)
+        self._publish(self._payload_on)
         self.async_write_ha_state()
 
 
     async def async_turn_off(self, **kwargs):
-        payload = json.loads(self._cfg.get("payload_off") or {"address":54058,"type":"switch","power":false,"version":"v1.0"})
         self._attr_is_on = False
-        self._publish(payload)
+        self._publish(self._payload_off)
         self.async_write_ha_state()
 
 
     # ---------------------------------------------------------
     #  UPDATE FROM DEVICE PAYLOAD
     # ---------------------------------------------------------
-    async def _update_from_payload(self, payload):
+    def _raw_status_unchanged(self, raw: bytes) -> bool:
+        """Bytes-level probe: True if the frame repeats the current power state.
+
+        The central handler calls this before decoding, so steady-state reports
+        never reach the JSON parser. Only a frame with one top-level "switch" block
+        holding the only power field is judged here; anything else falls through.
+        """
+        if raw.count(b'"power"') != 1 or len(_SWITCH_KEY_RE.findall(raw)) != 1:
+            return False
+        match = _POWER_RE.search(raw)
+        if match is None or not raw_in_outer_object(raw, match.start()):
+            return False
+        value = match.group(1)
+        power = value == b"true" if value[0] in b"tf" else int(value) != 0
+        return power is self._attr_is_on
+
+    @callback
+    def _update_from_payload(self, payload):
         """Update switch state from device MQTT payload."""
         try:
             if payload.get("address") != self.address:
@@ -163,7 +196,9 @@ class LytivaSwitch(SwitchEntity):
             if power is not None:
                 self._attr_is_on = bool(power)
 
-            self.async_write_ha_state()
+            # not added yet (batched add pending): HA writes the applied state on add
+            if self.platform is not None:
+                self.async_write_ha_state()
 
         except Exception as e:
             _LOGGER.exception("Switch update error: %s", e)
\ No newline at end of file